@@ -0,0 +1,64 @@
+import argparse
+import time
+import tracemalloc
+
+from log_columns import LogColumns, epoch_to_timestamp
+from main import parse_logs
+
+EVENTS = ['INFO', 'INFO', 'INFO', 'WARNING', 'INFO', 'INFO', 'INFO', 'ERROR']
+MESSAGES = [
+    'Rocket initialization process started.',
+    'Power systems online. Batteries at optimal charge.',
+    'Oxygen tank unstable.',
+    'Center and mission control systems powered down.',
+]
+START_EPOCH = 1693130400
+
+
+def generate_lines(count):
+    for i in range(count):
+        yield f'{epoch_to_timestamp(START_EPOCH + i)},{EVENTS[i % 8]},{MESSAGES[i % 4]} #{i}\n'
+
+
+def measure(label, build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{label:<10}: 생성 {elapsed:6.2f}s, 메모리 {current / 1024 / 1024:8.1f} MB')
+    return result, current
+
+
+def timed(label, func, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f'  {label:<24}: {elapsed * 1000:8.2f} ms ({result}건)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='열 단위 로그 저장소 벤치마크')
+    parser.add_argument('--lines', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    lines = list(generate_lines(args.lines))
+    records, tuple_bytes = measure('튜플 목록', lambda: parse_logs(lines))
+    columns, column_bytes = measure('열 저장소', lambda: LogColumns.from_records(records))
+    print(f'메모리 감소: {tuple_bytes / column_bytes:.1f}배')
+
+    start = epoch_to_timestamp(START_EPOCH + args.lines // 2)
+    end = epoch_to_timestamp(START_EPOCH + args.lines // 2 + 600)
+
+    print('튜플 목록')
+    timed('ERROR 필터', lambda: len([r for r in records if r[1] == 'ERROR']))
+    timed('10분 구간 필터', lambda: len([r for r in records if start <= r[0] <= end]))
+    print('열 저장소')
+    timed('ERROR 필터', lambda: len(columns.event_positions('ERROR')))
+    timed('10분 구간 필터', lambda: len(columns.time_range_positions(start, end)))
+
+
+if __name__ == '__main__':
+    main()
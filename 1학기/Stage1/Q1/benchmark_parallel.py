@@ -0,0 +1,67 @@
+import argparse
+import os
+import tempfile
+import time
+
+from main import parse_logs, parse_logs_parallel, read_log_file, summarize_logs_parallel
+
+EVENTS = ['INFO', 'WARNING', 'ERROR']
+MESSAGES = [
+    'Rocket initialization process started.',
+    'Power systems online. Batteries at optimal charge.',
+    'Oxygen tank unstable.',
+    'Center and mission control systems powered down.',
+]
+
+
+def generate_log(file_path, size_mb):
+    target = size_mb * 1024 * 1024
+    written = 0
+    seconds = 0
+    with open(file_path, 'w', encoding='utf-8', buffering=1024 * 1024) as file:
+        file.write('timestamp,event,message\n')
+        while written < target:
+            lines = []
+            for i in range(10000):
+                minute, second = divmod(seconds + i, 60)
+                hour, minute = divmod(minute, 60)
+                lines.append(f'2023-08-27 {hour % 24:02d}:{minute:02d}:{second:02d},'
+                             f'{EVENTS[i % 3]},{MESSAGES[i % 4]}\n')
+            seconds += 10000
+            chunk = ''.join(lines)
+            file.write(chunk)
+            written += len(chunk)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='병렬 로그 파싱 벤치마크')
+    parser.add_argument('--size-mb', type=int, default=2048)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_path = os.path.join(tmp_dir, 'synthetic.log')
+        print(f'합성 로그 생성 중: {args.size_mb} MB')
+        generate_log(log_path, args.size_mb)
+
+        start = time.perf_counter()
+        serial_count = sum(1 for _ in parse_logs(read_log_file(log_path, echo=False, stream=True), stream=True))
+        serial_time = time.perf_counter() - start
+        print(f'직렬   : {serial_time:8.2f}s  ({serial_count} 줄)')
+
+        workers = 1
+        while workers <= args.max_workers:
+            start = time.perf_counter()
+            count = sum(1 for _ in parse_logs_parallel(log_path, workers, stream=True))
+            elapsed = time.perf_counter() - start
+            print(f'workers={workers:<3}: {elapsed:8.2f}s  (x{serial_time / elapsed:.2f}, {count} 줄)')
+
+            start = time.perf_counter()
+            summary = summarize_logs_parallel(log_path, workers)
+            elapsed = time.perf_counter() - start
+            print(f'  요약 모드: {elapsed:8.2f}s  (x{serial_time / elapsed:.2f}, {summary.total} 줄)')
+            workers *= 2
+
+
+if __name__ == '__main__':
+    main()
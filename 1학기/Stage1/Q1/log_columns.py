@@ -0,0 +1,183 @@
+import bisect
+import calendar
+import re
+import time
+from array import array
+from itertools import compress
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+_day_epochs = {}
+
+
+def timestamp_to_epoch(timestamp):
+    # strptime보다 빠르도록 'YYYY-MM-DD HH:MM:SS' 자리를 직접 잘라서 변환하고, 날짜 부분은 캐시한다.
+    day = timestamp[:10]
+    day_epoch = _day_epochs.get(day)
+    if day_epoch is None:
+        day_epoch = _day_epochs[day] = calendar.timegm((int(day[0:4]), int(day[5:7]), int(day[8:10]), 0, 0, 0))
+    return (day_epoch + int(timestamp[11:13]) * 3600 + int(timestamp[14:16]) * 60
+            + int(timestamp[17:19] or 0))
+
+
+TIMESTAMP_PREFIX = re.compile(r'\d{4}-\d\d-\d\d[ T]\d\d:\d\d:\d\d')
+
+
+# 시간 앞부분의 자리별 (시작, 끝, 최소값, 최대값). 일의 최대값은 그 달의 날 수로 다시 줄인다.
+TIMESTAMP_FIELDS = ((0, 4, 1, 9999), (5, 7, 1, 12), (8, 10, 1, 31), (11, 13, 0, 23), (14, 16, 0, 59), (17, 19, 0, 59))
+
+
+def prefix_to_epoch(prefix, upper=False):
+    # 'YYYY-MM-DD' 같은 앞부분을 그 앞부분으로 시작하는 가장 이른(upper면 가장 늦은) 시각의 epoch로 바꾼다.
+    # query_time_range처럼 시작은 앞부분 이상, 끝은 앞부분까지 같은 줄을 모두 포함하게 된다.
+    if len(prefix) >= 19:
+        return timestamp_to_epoch(prefix)
+    values = []
+    for begin, end, low, high in TIMESTAMP_FIELDS:
+        if begin == 8:
+            high = calendar.monthrange(values[0], values[1])[1]
+        digits = prefix[begin:end]
+        if len(digits) < end - begin:
+            # 자리 중간에서 끊겼으면 남은 자리를 0(upper면 9)으로 채운 뒤 가능한 값 안으로 맞춘다.
+            fill = '9' if upper else '0'
+            value = int(digits + fill * (end - begin - len(digits))) if digits else (high if upper else low)
+            value = min(max(value, low), high)
+        else:
+            value = int(digits)
+        values.append(value)
+    return calendar.timegm(tuple(values))
+
+
+def parse_epoch(timestamp):
+    # 'YYYY-MM-DD HH:MM:SS'(또는 T 구분자)로 시작하면 초 단위 epoch를, 아니면 None을 돌려준다.
+    # '2023-13-01'처럼 달이 범위를 벗어나 epoch로 바꿀 수 없어도 None이다.
+    if TIMESTAMP_PREFIX.match(timestamp) is None:
+        return None
+    try:
+        return timestamp_to_epoch(timestamp)
+    except ValueError:
+        return None
+
+
+def epoch_to_timestamp(epoch):
+    return time.strftime(TIMESTAMP_FORMAT, time.gmtime(epoch))
+
+
+_canonical_days = {}
+
+
+def is_canonical_timestamp(timestamp):
+    # epoch_to_timestamp(parse_epoch(timestamp)) == timestamp 인지를 행마다 strftime을 부르지 않고 확인한다.
+    # '23:59:60', '24:00:00', '2023-02-30'처럼 epoch로 바꾸면 다른 시각이 되는 값은 False다.
+    if len(timestamp) != 19 or timestamp[10] != ' ':
+        return False
+    if timestamp[11:13] > '23' or timestamp[14:16] > '59' or timestamp[17:19] > '59':
+        return False
+    day = timestamp[:10]
+    canonical = _canonical_days.get(day)
+    if canonical is None:
+        epoch = parse_epoch(day + ' 00:00:00')
+        canonical = _canonical_days[day] = epoch is not None and epoch_to_timestamp(epoch)[:10] == day
+    return canonical
+
+
+class LogColumns:
+    # 파싱된 로그를 열 단위로 저장한다.
+    # 시간은 int64 배열, 이벤트는 코드 배열(종류가 256개를 넘으면 2바이트, 65536개를 넘으면 4바이트로 넓힌다), 메시지는 하나의 바이트 덩어리와 위치 배열로 보관한다.
+    # epoch에서 똑같이 되살릴 수 없는 시간 문자열(헤더 줄, 소수점 초, 다른 형식, '24:00:00'이나 '2023-02-30' 같은 범위 밖 값)은 raw_timestamps에 원문을 둔다.
+    def __init__(self):
+        self.timestamps = array('q')
+        self.raw_timestamps = {}
+        # 시간으로 읽을 수 없는 줄. 정렬을 깨지 않도록 앞 줄의 epoch를 넣어 두고, 시간 구간 검색에서는 뺀다.
+        self.unparsed = set()
+        self.event_codes = array('B')
+        self.event_names = []
+        self.event_index = {}
+        self.message_offsets = array('Q', [0])
+        self.message_data = bytearray()
+
+    @classmethod
+    def from_records(cls, parsed_logs):
+        columns = cls()
+        for record in parsed_logs:
+            columns.append(record)
+        return columns
+
+    def append(self, record):
+        timestamp, event, message = record
+        code = self.event_index.get(event)
+        if code is None:
+            code = self.event_index[event] = len(self.event_names)
+            if code == 1 << (8 * self.event_codes.itemsize):
+                self.event_codes = array('H' if code == 256 else 'I', self.event_codes)
+            self.event_names.append(event)
+
+        i = len(self.timestamps)
+        epoch = parse_epoch(timestamp)
+        if epoch is None:
+            epoch = self.timestamps[-1] if i else -2 ** 63
+            self.unparsed.add(i)
+            self.raw_timestamps[i] = timestamp
+        elif not is_canonical_timestamp(timestamp):
+            self.raw_timestamps[i] = timestamp
+        self.timestamps.append(epoch)
+        self.event_codes.append(code)
+        self.message_data += message.encode('utf-8')
+        self.message_offsets.append(len(self.message_data))
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        message = self.message_data[self.message_offsets[i]:self.message_offsets[i + 1]]
+        timestamp = self.raw_timestamps.get(i)
+        if timestamp is None:
+            timestamp = epoch_to_timestamp(self.timestamps[i])
+        return (timestamp,
+                self.event_names[self.event_codes[i]],
+                message.decode('utf-8'))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def nbytes(self):
+        return (self.timestamps.itemsize * len(self.timestamps)
+                + self.event_codes.itemsize * len(self.event_codes)
+                + self.message_offsets.itemsize * len(self.message_offsets)
+                + len(self.message_data)
+                + sum(len(timestamp) for timestamp in self.raw_timestamps.values()))
+
+    def count_event(self, event):
+        code = self.event_index.get(event)
+        return 0 if code is None else self.event_codes.count(code)
+
+    def event_positions(self, event):
+        # 코드 배열을 0/1 마스크로 바꾼 뒤 compress로 고르므로 반복이 C 수준에서 처리된다.
+        code = self.event_index.get(event)
+        if code is None:
+            return []
+        if self.event_codes.typecode != 'B':
+            return list(compress(range(len(self.event_codes)), map(code.__eq__, self.event_codes)))
+        table = bytes(1 if value == code else 0 for value in range(256))
+        mask = self.event_codes.tobytes().translate(table)
+        return list(compress(range(len(mask)), mask))
+
+    def filter_event(self, event):
+        for i in self.event_positions(event):
+            yield self[i]
+
+    def time_range_positions(self, start, end):
+        # 로그가 시간순이라고 가정하고 이분 탐색으로 [start, end] 구간을 찾는다. 'YYYY-MM-DD' 같은 앞부분만 줘도 된다.
+        low = bisect.bisect_left(self.timestamps, prefix_to_epoch(start))
+        high = bisect.bisect_right(self.timestamps, prefix_to_epoch(end, upper=True))
+        if not self.unparsed:
+            return range(low, high)
+        return [i for i in range(low, high) if i not in self.unparsed]
+
+    def filter_time_range(self, start, end):
+        for i in self.time_range_positions(start, end):
+            yield self[i]
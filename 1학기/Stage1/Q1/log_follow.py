@@ -0,0 +1,97 @@
+import hashlib
+import json
+import os
+
+from log_summary import LogSummary
+
+CHECKPOINT_SUFFIX = '.checkpoint.json'
+# 로그 앞부분을 이만큼 해시해 두고, 같은 파일이 잘린 뒤 다시 자랐는지 확인한다.
+HEAD_BYTES = 4096
+
+
+def checkpoint_path_for(log_path):
+    return log_path + CHECKPOINT_SUFFIX
+
+
+def head_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def new_checkpoint(mode=None):
+    # mode는 보고서를 만든 방식('summary' 또는 'full')이다. 방식이 바뀌면 보고서를 처음부터 다시 쓴다.
+    return {
+        'mode': mode,
+        'inode': None,
+        'offset': 0,
+        'head_size': 0,
+        'head': head_digest(b''),
+        'summary': LogSummary(),
+    }
+
+
+def load_checkpoint(checkpoint_path):
+    try:
+        with open(checkpoint_path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+            return {
+                'mode': data.get('mode'),
+                'inode': data['inode'],
+                'offset': data['offset'],
+                'head_size': data['head_size'],
+                'head': data['head'],
+                'summary': LogSummary.from_dict(data['summary']),
+            }
+    except (FileNotFoundError, ValueError, KeyError):
+        return new_checkpoint()
+
+
+def save_checkpoint(checkpoint_path, checkpoint):
+    # 중간에 종료되어도 체크포인트가 깨지지 않도록 임시 파일에 쓰고 교체한다.
+    tmp_path = checkpoint_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump({
+            'mode': checkpoint['mode'],
+            'inode': checkpoint['inode'],
+            'offset': checkpoint['offset'],
+            'head_size': checkpoint['head_size'],
+            'head': checkpoint['head'],
+            'summary': checkpoint['summary'].to_dict(),
+        }, file, ensure_ascii=False)
+    os.replace(tmp_path, checkpoint_path)
+
+
+def log_replaced(log_path, checkpoint):
+    # 로그가 교체(rotation)되었거나 잘렸으면 True. 잘린 뒤 다시 자라 크기가 offset을 넘었어도
+    # 앞부분 해시가 다르거나 offset 바로 앞 바이트가 줄 끝이 아니면 다른 내용이다.
+    stat = os.stat(log_path)
+    offset = checkpoint['offset']
+    if checkpoint['inode'] != stat.st_ino or stat.st_size < offset:
+        return True
+    with open(log_path, 'rb') as file:
+        if head_digest(file.read(checkpoint['head_size'])) != checkpoint['head']:
+            return True
+        if offset > 0:
+            file.seek(offset - 1)
+            return file.read(1) != b'\n'
+    return False
+
+
+def read_new_lines(log_path, checkpoint):
+    # 마지막 위치 이후에 추가된 완전한 줄만 돌려주고 checkpoint['offset']을 함께 옮긴다.
+    # 교체나 잘림은 log_replaced로 먼저 확인해 새 체크포인트로 시작해야 한다.
+    checkpoint['inode'] = os.stat(log_path).st_ino
+
+    with open(log_path, 'rb') as file:
+        file.seek(checkpoint['offset'])
+        for line in file:
+            if not line.endswith(b'\n'):
+                # 아직 쓰는 중인 마지막 줄은 다음 실행에서 읽는다.
+                break
+            checkpoint['offset'] += len(line)
+            yield line.decode('utf-8')
+
+        if checkpoint['head_size'] < HEAD_BYTES:
+            file.seek(0)
+            head = file.read(min(checkpoint['offset'], HEAD_BYTES))
+            checkpoint['head_size'] = len(head)
+            checkpoint['head'] = head_digest(head)
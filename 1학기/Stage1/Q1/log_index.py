@@ -0,0 +1,102 @@
+import bisect
+import mmap
+import os
+
+INDEX_STEP = 1024
+INDEX_SUFFIX = '.idx'
+
+
+def index_path_for(log_path):
+    return log_path + INDEX_SUFFIX
+
+
+def index_lines(file, offset, line_count, entries, step=INDEX_STEP):
+    # offset부터 끝까지 완전한 줄만 훑으며 step 줄마다 (시간, 바이트 위치)를 entries에 더한다.
+    # 아직 쓰는 중인 마지막 줄은 다음에 이어서 색인한다.
+    file.seek(offset)
+    for line in file:
+        if not line.endswith(b'\n'):
+            break
+        timestamp = line.split(b',', 1)[0].decode('utf-8')
+        if timestamp[:1].isdigit():
+            if line_count % step == 0:
+                entries.append((timestamp, offset))
+            line_count += 1
+        offset += len(line)
+    return offset, line_count
+
+
+def save_log_index(log_path, stat, offset, line_count, entries):
+    # 헤더: 크기, 수정 시각, inode, 색인한 마지막 위치, 그때까지의 줄 수
+    with open(index_path_for(log_path), 'w', encoding='utf-8') as file:
+        file.write(f'{stat.st_size},{stat.st_mtime_ns},{stat.st_ino},{offset},{line_count}\n')
+        for timestamp, entry_offset in entries:
+            file.write(f'{timestamp},{entry_offset}\n')
+
+
+def build_log_index(log_path, step=INDEX_STEP):
+    # step 줄마다 (시간, 바이트 위치)를 하나씩 기록하는 희소 인덱스를 만든다.
+    stat = os.stat(log_path)
+    entries = []
+    with open(log_path, 'rb') as file:
+        offset, line_count = index_lines(file, 0, 0, entries, step)
+    save_log_index(log_path, stat, offset, line_count, entries)
+    return entries
+
+
+def load_log_index(log_path, step=INDEX_STEP):
+    # 로그가 뒤에 이어 쓰이기만 했으면 늘어난 부분만 색인하고,
+    # 줄어들었거나 다른 파일로 바뀌었으면(inode) 처음부터 다시 만든다.
+    stat = os.stat(log_path)
+    try:
+        with open(index_path_for(log_path), 'r', encoding='utf-8') as file:
+            size, mtime_ns, inode, offset, line_count = map(int, file.readline().strip().split(','))
+            entries = []
+            for line in file:
+                timestamp, entry_offset = line.rstrip('\n').rsplit(',', 1)
+                entries.append((timestamp, int(entry_offset)))
+    except (FileNotFoundError, ValueError):
+        return build_log_index(log_path, step)
+
+    if inode != stat.st_ino or stat.st_size < offset:
+        return build_log_index(log_path, step)
+    if size == stat.st_size and mtime_ns == stat.st_mtime_ns:
+        return entries
+    with open(log_path, 'rb') as file:
+        if offset > 0:
+            file.seek(offset - 1)
+            if file.read(1) != b'\n':
+                # 색인한 마지막 위치가 줄 끝이 아니면 내용이 바뀐 것이다.
+                return build_log_index(log_path, step)
+        offset, line_count = index_lines(file, offset, line_count, entries, step)
+    save_log_index(log_path, stat, offset, line_count, entries)
+    return entries
+
+
+def query_time_range(log_path, start, end):
+    # start <= 시간 <= end 인 줄만 돌려준다. 'YYYY-MM-DD HH:MM' 같은 앞부분만 줘도 된다.
+    entries = load_log_index(log_path)
+    if not entries:
+        return []
+    timestamps = [timestamp for timestamp, _ in entries]
+    position = bisect.bisect_left(timestamps, start) - 1
+    offset = entries[max(position, 0)][1]
+
+    results = []
+    with open(log_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        while offset < size:
+            newline = mm.find(b'\n', offset)
+            if newline == -1:
+                newline = size
+            line = mm[offset:newline].decode('utf-8').rstrip('\r')
+            offset = newline + 1
+            parts = line.split(',', 2)
+            if len(parts) != 3:
+                continue
+            timestamp = parts[0]
+            if timestamp[:len(end)] > end:
+                break
+            if timestamp >= start:
+                results.append(tuple(parts))
+    return results
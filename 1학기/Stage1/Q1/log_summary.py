@@ -0,0 +1,161 @@
+from collections import Counter
+
+TOP_N = 10
+# 메시지별 횟수는 최대 이만큼만 추적한다(Misra-Gries). 서로 다른 메시지가 이보다 적으면 횟수가 정확하다.
+MESSAGE_CAPACITY = 1000
+# 시간대별 로그 수 표는 최대 이만큼의 행만 둔다. 넘치면 분 → 시 → 일 → 월 → 년 단위로 묶는다.
+TIME_ROWS = 1000
+# 타임스탬프('2023-08-27 10:00:00')에서 잘라 쓰는 길이와 그 단위 이름.
+TIME_WIDTHS = {16: '분', 13: '시', 10: '일', 7: '월', 4: '년'}
+
+
+def regroup_times(counts, width):
+    regrouped = Counter()
+    for key, count in counts.items():
+        regrouped[key[:width]] += count
+    return regrouped
+
+
+class LogSummary:
+    # 파싱된 로그를 한 번만 훑으면서 보고서에 필요한 통계를 모은다.
+    def __init__(self, message_capacity=MESSAGE_CAPACITY, time_rows=TIME_ROWS):
+        self.message_capacity = message_capacity
+        self.time_rows = time_rows
+        self.total = 0
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self.events = {}
+        self.time_width = 16
+        self.time_counts = Counter()
+        self.messages = Counter()
+        # 메시지 횟수가 실제보다 최대 얼마나 적게 세어졌는지.
+        self.message_error = 0
+
+    def _add_message(self, message):
+        if message in self.messages or len(self.messages) < self.message_capacity:
+            self.messages[message] += 1
+            return
+        # 자리가 없으면 모든 카운터를 1씩 줄인다. 줄인 총량만큼 앞서 더해진 것이므로 전체 비용은 상각 O(1)이다.
+        self.messages = Counter({m: c - 1 for m, c in self.messages.items() if c > 1})
+        self.message_error += 1
+
+    def _trim_messages(self):
+        # 합친 뒤 카운터가 넘치면 (capacity+1)번째로 큰 값만큼 모두에서 빼서 다시 capacity개 이하로 만든다.
+        if len(self.messages) <= self.message_capacity:
+            return
+        cut = sorted(self.messages.values(), reverse=True)[self.message_capacity]
+        self.messages = Counter({m: c - cut for m, c in self.messages.items() if c > cut})
+        self.message_error += cut
+
+    def _coarsen_times(self):
+        # 표가 time_rows행을 넘으면 한 단계씩 더 굵은 단위로 묶는다.
+        widths = list(TIME_WIDTHS)
+        while len(self.time_counts) > self.time_rows and self.time_width != widths[-1]:
+            self.time_width = widths[widths.index(self.time_width) + 1]
+            self.time_counts = regroup_times(self.time_counts, self.time_width)
+
+    def update(self, record):
+        timestamp, event, message = record
+        if not timestamp[:1].isdigit():
+            return
+        self.total += 1
+        if self.first_timestamp is None:
+            self.first_timestamp = timestamp
+        self.last_timestamp = timestamp
+
+        stats = self.events.get(event)
+        if stats is None:
+            stats = self.events[event] = {'count': 0, 'first': timestamp, 'last': timestamp}
+        stats['count'] += 1
+        stats['last'] = timestamp
+
+        self.time_counts[timestamp[:self.time_width]] += 1
+        if len(self.time_counts) > self.time_rows:
+            self._coarsen_times()
+        self._add_message(message)
+
+    def merge(self, other):
+        # other는 self 뒤에 이어지는 구간의 통계여야 한다.
+        if other.total == 0:
+            return self
+        self.total += other.total
+        if self.first_timestamp is None:
+            self.first_timestamp = other.first_timestamp
+        self.last_timestamp = other.last_timestamp
+        for event, other_stats in other.events.items():
+            stats = self.events.get(event)
+            if stats is None:
+                self.events[event] = dict(other_stats)
+            else:
+                stats['count'] += other_stats['count']
+                stats['last'] = other_stats['last']
+        # 두 쪽 중 더 굵은 단위로 맞춰 더한다.
+        self.time_width = min(self.time_width, other.time_width)
+        self.time_counts = regroup_times(self.time_counts, self.time_width)
+        self.time_counts.update(regroup_times(other.time_counts, self.time_width))
+        self._coarsen_times()
+        self.messages.update(other.messages)
+        self.message_error += other.message_error
+        self._trim_messages()
+        return self
+
+    def to_dict(self):
+        return {
+            'total': self.total,
+            'first_timestamp': self.first_timestamp,
+            'last_timestamp': self.last_timestamp,
+            'events': self.events,
+            'time_width': self.time_width,
+            'time_counts': dict(self.time_counts),
+            'messages': dict(self.messages),
+            'message_capacity': self.message_capacity,
+            'message_error': self.message_error,
+            'time_rows': self.time_rows,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        summary = cls(data.get('message_capacity', MESSAGE_CAPACITY), data.get('time_rows', TIME_ROWS))
+        summary.total = data['total']
+        summary.first_timestamp = data['first_timestamp']
+        summary.last_timestamp = data['last_timestamp']
+        summary.events = data['events']
+        summary.time_width = data['time_width']
+        summary.time_counts = Counter(data['time_counts'])
+        summary._coarsen_times()
+        summary.messages = Counter(data['messages'])
+        summary.message_error = data.get('message_error', 0)
+        summary._trim_messages()
+        return summary
+
+    def write_markdown(self, file, top_n=TOP_N):
+        file.write('## 요약 통계\n')
+        file.write(f'전체 로그 수: {self.total}\n\n')
+        file.write(f'기간: {self.first_timestamp} ~ {self.last_timestamp}\n\n')
+
+        file.write('### 이벤트별 통계\n')
+        file.write('| 이벤트 | 개수 | 처음 발생 | 마지막 발생 |\n')
+        file.write('|---|---|---|---|\n')
+        for event, stats in sorted(self.events.items(), key=lambda item: -item[1]['count']):
+            file.write(f"| {event} | {stats['count']} | {stats['first']} | {stats['last']} |\n")
+        file.write('\n')
+
+        unit = TIME_WIDTHS[self.time_width]
+        file.write(f'### {unit}당 로그 수\n' if unit == '분' else f'### {unit} 단위 로그 수\n')
+        if self.time_width != 16:
+            file.write(f'(기간이 길어 표가 {self.time_rows}행을 넘지 않도록 {unit} 단위로 묶었습니다.)\n\n')
+        file.write(f'| 시간({unit}) | 개수 |\n')
+        file.write('|---|---|\n')
+        for key in sorted(self.time_counts):
+            file.write(f'| {key} | {self.time_counts[key]} |\n')
+        file.write('\n')
+
+        file.write(f'### 자주 나온 메시지 Top {top_n}\n')
+        if self.message_error:
+            file.write(f'(메시지 종류가 많아 근사값입니다. 각 횟수는 실제보다 최대 {self.message_error}만큼 적을 수 있습니다.)\n\n')
+        file.write('| 순위 | 메시지 | 횟수 |\n')
+        file.write('|---|---|---|\n')
+        for rank, (message, count) in enumerate(self.messages.most_common(top_n), 1):
+            message = message.replace('|', '\\|')
+            file.write(f'| {rank} | {message} | {count} |\n')
+        file.write('\n')
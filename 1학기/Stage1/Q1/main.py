@@ -1,9 +1,30 @@
-def read_log_file( file_path ):
+import argparse
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from log_follow import (checkpoint_path_for, load_checkpoint, log_replaced, new_checkpoint,
+                        read_new_lines, save_checkpoint)
+from log_columns import LogColumns
+from log_index import query_time_range
+from log_summary import TOP_N, LogSummary
+
+BUFFER_SIZE = 1024 * 1024
+CHUNK_SIZE = 64 * 1024 * 1024
+
+
+def read_log_file( file_path, echo = True, stream = False ):
     try:
+        if stream:
+            file = open( file_path, 'r', encoding = 'utf-8', buffering = BUFFER_SIZE )
+            return iter_log_lines( file, echo )
         with open( file_path, 'r', encoding = 'utf-8' ) as file:
             log_contents = file.readlines()
-            for line in log_contents:
-                print(line.strip())
+            if echo:
+                for line in log_contents:
+                    print(line.strip())
             return log_contents
     except FileNotFoundError:
         print( '\n오류: ' + file_path + ' 파일을 찾을 수 없습니다.' )
@@ -12,40 +33,237 @@ def read_log_file( file_path ):
         print( '\n오류 발생: ' + str( e ) )
         return None
 
-def parse_logs(log_contents):
-    parsed_logs = []
+def iter_log_lines(file, echo=False):
+    # 파일을 한 줄씩 흘려보내므로 로그 크기와 관계없이 메모리 사용량이 일정하다.
+    with file:
+        for line in file:
+            if echo:
+                print(line.strip())
+            yield line
+
+def iter_parse_logs(log_contents):
     for line in log_contents:
         parts = line.strip().split(',', 2)
         if len(parts) == 3:
-            timestamp, event, message = parts
-            parsed_logs.append((timestamp, event, message))
-    return parsed_logs
+            yield tuple(parts)
+
+def parse_logs(log_contents, stream=False, columnar=False):
+    if stream:
+        return iter_parse_logs(log_contents)
+    if columnar:
+        return LogColumns.from_records(iter_parse_logs(log_contents))
+    return list(iter_parse_logs(log_contents))
 
-def write_markdown_report(report_path, parsed_logs):
-    with open(report_path, 'w', encoding='utf-8') as file:
-        file.write('# 보고서\n\n')
-        file.write('## 개요\n')
-        file.write('이 보고서는 로그 파일을 분석하여 정리한 문서입니다.\n\n')
+def find_chunk_ranges(file_path, chunk_size=CHUNK_SIZE):
+    # 줄 중간에서 잘리지 않도록 각 경계를 다음 줄바꿈 뒤로 맞춘다.
+    file_size = os.path.getsize(file_path)
+    ranges = []
+    with open(file_path, 'rb') as file:
+        start = 0
+        while start < file_size:
+            end = min(start + chunk_size, file_size)
+            if end < file_size:
+                file.seek(end)
+                file.readline()
+                end = file.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
 
-        file.write('## 전체 로그 기록\n')
-        for timestamp, event, message in parsed_logs:
-            file.write('시간:' + timestamp + '\n')
-            file.write('이벤트:' + event + '\n')
-            file.write('메시지:' + message + '\n\n')
+def parse_chunk(task):
+    file_path, start, end = task
+    with open(file_path, 'rb') as file:
+        file.seek(start)
+        data = file.read(end - start)
+    return list(iter_parse_logs(data.decode('utf-8').split('\n')))
+
+def bounded_map(pool, func, tasks, window):
+    # pool.map은 모든 구간을 한꺼번에 제출하고 끝난 결과를 소비될 때까지 쥐고 있으므로,
+    # 앞선 결과를 소비한 만큼만 새 구간을 제출해 동시에 메모리에 있는 구간을 window개로 제한한다.
+    pending = deque()
+    for task in tasks:
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(pool.submit(func, task))
+    while pending:
+        yield pending.popleft().result()
+
+def iter_parse_logs_parallel(file_path, workers=None, chunk_size=CHUNK_SIZE):
+    # 구간은 파일 순서대로 나뉘고 제출한 순서대로 결과를 꺼내므로 직렬 경로와 같은 순서로 합쳐진다.
+    workers = workers or os.cpu_count()
+    chunk_size = max(1, min(chunk_size, os.path.getsize(file_path) // (workers * 4)))
+    tasks = [(file_path, start, end) for start, end in find_chunk_ranges(file_path, chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for records in bounded_map(pool, parse_chunk, tasks, workers * 2):
+            yield from records
+
+def summarize_chunk(task):
+    summary = LogSummary()
+    for record in parse_chunk(task):
+        summary.update(record)
+    return summary
+
+def summarize_logs_parallel(file_path, workers=None, chunk_size=CHUNK_SIZE):
+    # 각 프로세스가 구간 통계만 돌려주므로 레코드를 주고받는 비용이 없다.
+    workers = workers or os.cpu_count()
+    chunk_size = max(1, min(chunk_size, os.path.getsize(file_path) // (workers * 4)))
+    tasks = [(file_path, start, end) for start, end in find_chunk_ranges(file_path, chunk_size)]
+    summary = LogSummary()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk_summary in bounded_map(pool, summarize_chunk, tasks, workers * 2):
+            summary.merge(chunk_summary)
+    return summary
+
+def parse_logs_parallel(file_path, workers=None, chunk_size=CHUNK_SIZE, stream=False):
+    if not os.path.exists(file_path):
+        print( '\n오류: ' + file_path + ' 파일을 찾을 수 없습니다.' )
+        return None
+    parsed_logs = iter_parse_logs_parallel(file_path, workers, chunk_size)
+    if stream:
+        return parsed_logs
+    return list(parsed_logs)
 
-    print('\n보고서가 생성되었습니다: log_analysis.md')
+def write_report_header(file):
+    file.write('# 보고서\n\n')
+    file.write('## 개요\n')
+    file.write('이 보고서는 로그 파일을 분석하여 정리한 문서입니다.\n\n')
+
+def write_report_entries(file, parsed_logs):
+    for timestamp, event, message in parsed_logs:
+        file.write('시간:' + timestamp + '\n')
+        file.write('이벤트:' + event + '\n')
+        file.write('메시지:' + message + '\n\n')
+
+def iter_with_summary(parsed_logs, summary):
+    for record in parsed_logs:
+        summary.update(record)
+        yield record
+
+def write_markdown_report(report_path, parsed_logs, summary=False, full=True, top_n=TOP_N):
+    # summary를 켜면 한 번의 순회로 통계를 모으고, full일 때만 전체 로그를 함께 기록한다.
+    with open(report_path, 'w', encoding='utf-8', buffering=BUFFER_SIZE) as file:
+        write_report_header(file)
+        if summary:
+            if isinstance(parsed_logs, LogSummary):
+                log_summary = parsed_logs
+            else:
+                log_summary = LogSummary()
+                parsed_logs = iter_with_summary(parsed_logs, log_summary)
+                if full:
+                    file.write('## 전체 로그 기록\n')
+                    write_report_entries(file, parsed_logs)
+                else:
+                    for _ in parsed_logs:
+                        pass
+            log_summary.write_markdown(file, top_n)
+        else:
+            file.write('## 전체 로그 기록\n')
+            write_report_entries(file, parsed_logs)
+
+    print('\n보고서가 생성되었습니다: ' + report_path)
+
+def follow_log_once(log_path, report_path, checkpoint_path, summary=False, top_n=TOP_N):
+    # 체크포인트 이후 새로 추가된 줄만 파싱해서 통계를 갱신하고 보고서 끝에 덧붙인다.
+    mode = 'summary' if summary else 'full'
+    checkpoint = load_checkpoint(checkpoint_path)
+    # 로그가 교체되었거나 잘렸으면 누적 통계를 버리고 처음부터 다시 읽는다.
+    fresh = (checkpoint['inode'] is None or checkpoint['mode'] != mode or not os.path.exists(report_path)
+             or log_replaced(log_path, checkpoint))
+    if fresh:
+        checkpoint = new_checkpoint(mode)
+    log_summary = checkpoint['summary']
+    before = log_summary.total
+
+    parsed_logs = iter_with_summary(iter_parse_logs(read_new_lines(log_path, checkpoint)), log_summary)
+    if summary:
+        # 요약 보고서는 크기가 작으므로 누적 통계로 매번 새로 쓴다.
+        for _ in parsed_logs:
+            pass
+        write_markdown_report(report_path, log_summary, summary=True, top_n=top_n)
+    else:
+        with open(report_path, 'w' if fresh else 'a', encoding='utf-8', buffering=BUFFER_SIZE) as file:
+            if fresh:
+                write_report_header(file)
+                file.write('## 전체 로그 기록\n')
+            write_report_entries(file, parsed_logs)
+    save_checkpoint(checkpoint_path, checkpoint)
+
+    event_counts = {event: stats['count'] for event, stats in log_summary.events.items()}
+    print(f'\n새 로그 {log_summary.total - before}줄 반영 (누적 {log_summary.total}줄, '
+          f'{log_summary.first_timestamp} ~ {log_summary.last_timestamp})')
+    print('이벤트별 개수: ' + json.dumps(event_counts, ensure_ascii=False))
+
+def follow_log(log_path, report_path, interval=None, summary=False, top_n=TOP_N):
+    checkpoint_path = checkpoint_path_for(log_path)
+    try:
+        while True:
+            if os.path.exists(log_path):
+                follow_log_once(log_path, report_path, checkpoint_path, summary, top_n)
+            else:
+                print( '\n오류: ' + log_path + ' 파일을 찾을 수 없습니다.' )
+            if not interval:
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print('\n추적을 종료합니다.')
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='화성 기지 미션 로그 분석기')
+    parser.add_argument('log_file', nargs='?', default='mission_computer_main.log')
+    parser.add_argument('report_file', nargs='?', default='log_analysis.md')
+    parser.add_argument('--stream', action='store_true',
+                        help='로그를 한 줄씩 처리하여 메모리 사용량을 일정하게 유지')
+    parser.add_argument('--quiet', action='store_true',
+                        help='읽은 로그를 콘솔에 출력하지 않음')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='2 이상이면 로그를 구간별로 나누어 여러 프로세스에서 파싱')
+    parser.add_argument('--range', nargs=2, metavar=('START', 'END'),
+                        help="시간 인덱스로 START~END 구간만 보고서에 기록 (예: '2023-08-27 10:05' '2023-08-27 10:20')")
+    parser.add_argument('--follow', action='store_true',
+                        help='체크포인트 이후 추가된 줄만 읽어 보고서를 갱신')
+    parser.add_argument('--interval', type=float,
+                        help='--follow와 함께 사용, 지정한 초마다 반복 실행')
+    parser.add_argument('--columnar', action='store_true',
+                        help='파싱 결과를 열 단위 저장소(LogColumns)에 보관하여 메모리 사용량을 줄임')
+    parser.add_argument('--summary', action='store_true',
+                        help='전체 로그 대신 이벤트별 통계, 시간대별 로그 수, 자주 나온 메시지만 기록')
+    parser.add_argument('--full', action='store_true',
+                        help='--summary와 함께 사용, 전체 로그 기록도 보고서에 포함')
+    parser.add_argument('--top', type=int, default=TOP_N,
+                        help='요약에 표시할 자주 나온 메시지 개수')
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
     print('Hello Mars\n')
-    log_file = 'mission_computer_main.log'
-    report_file = 'log_analysis.md'
+    report_options = {'summary': args.summary, 'full': args.full or not args.summary, 'top_n': args.top}
 
-    log_contents = read_log_file(log_file)
+    if args.follow:
+        follow_log(args.log_file, args.report_file, args.interval, args.summary, args.top)
+        return
 
-    if log_contents is not None:
-        parsed_logs = parse_logs(log_contents)
-        write_markdown_report(report_file, parsed_logs)
+    if args.range:
+        if not os.path.exists(args.log_file):
+            print( '\n오류: ' + args.log_file + ' 파일을 찾을 수 없습니다.' )
+            return
+        write_markdown_report(args.report_file, query_time_range(args.log_file, *args.range), **report_options)
+        return
 
+    if args.workers > 1:
+        if args.summary and not args.full and os.path.exists(args.log_file):
+            write_markdown_report(args.report_file, summarize_logs_parallel(args.log_file, args.workers),
+                                  **report_options)
+            return
+        parsed_logs = parse_logs_parallel(args.log_file, args.workers, stream=args.stream)
+        if parsed_logs is not None:
+            write_markdown_report(args.report_file, parsed_logs, **report_options)
+        return
+
+    log_contents = read_log_file(args.log_file, echo=not args.quiet, stream=args.stream)
+
+    if log_contents is not None:
+        parsed_logs = parse_logs(log_contents, stream=args.stream, columnar=args.columnar)
+        write_markdown_report(args.report_file, parsed_logs, **report_options)
 
 if __name__ == '__main__':
     main()
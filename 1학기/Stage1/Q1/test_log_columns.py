@@ -0,0 +1,23 @@
+import unittest
+
+from log_columns import LogColumns, is_canonical_timestamp
+
+
+class LogColumnsTimestampTest(unittest.TestCase):
+    # epoch로 바꾸면 다른 시각이 되는 시간 문자열도 원문 그대로 돌려줘야 한다.
+    def test_out_of_range_timestamps_round_trip(self):
+        timestamps = ['2023-08-27 23:59:60', '2023-08-27 24:00:00', '2023-02-30 10:00:00']
+        records = [(timestamp, 'INFO', 'message') for timestamp in timestamps]
+        columns = LogColumns.from_records(records)
+        self.assertEqual(list(columns), records)
+        self.assertEqual(sorted(columns.raw_timestamps), [0, 1, 2])
+
+    def test_canonical_timestamp_is_not_stored(self):
+        columns = LogColumns.from_records([('2023-08-27 10:00:00', 'INFO', 'message')])
+        self.assertEqual(list(columns), [('2023-08-27 10:00:00', 'INFO', 'message')])
+        self.assertEqual(columns.raw_timestamps, {})
+        self.assertFalse(is_canonical_timestamp('2023-13-01 10:00:00'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from main import read_csv, sort_flammability, filter_dangerous_items, save_csv_file, save_binary_file
+
+STRENGTHS = ['Very weak', 'Weak', 'Low', 'High', 'Very high', 'Very low', 'Various']
+HEADER = 'Substance,Weight (g/cm³),Specific Gravity,Strength,Flammability\n'
+STAGES = ['read_csv', 'sort_flammability', 'filter_dangerous_items', 'save_csv_file', 'save_binary_file']
+
+
+def generate_inventory_csv(file_path, rows, seed=0):
+    rng = random.Random(seed)
+    with open(file_path, 'w', encoding='utf-8', buffering=1024 * 1024) as file:
+        file.write(HEADER)
+        for start in range(0, rows, 10000):
+            lines = []
+            for i in range(start, min(start + 10000, rows)):
+                if rng.random() < 0.5:
+                    weight = specific_gravity = 'Various'
+                else:
+                    weight = f'{rng.uniform(0.001, 20):.3f}'
+                    specific_gravity = f'{rng.uniform(0.001, 20):.3f}'
+                lines.append(f'Substance {i},{weight},{specific_gravity},'
+                             f'{STRENGTHS[i % len(STRENGTHS)]},{rng.randint(0, 100) / 100}\n')
+            file.write(''.join(lines))
+
+
+def loop_pipeline(csv_path, out_dir):
+    header, inventory_list = yield 'read_csv', read_csv, (csv_path,)
+    sorted_inventory = yield 'sort_flammability', sort_flammability, (inventory_list,)
+    dangerous_items = yield 'filter_dangerous_items', filter_dangerous_items, (sorted_inventory,)
+    yield 'save_csv_file', save_csv_file, (os.path.join(out_dir, 'danger.csv'), header, dangerous_items)
+    yield 'save_binary_file', save_binary_file, (os.path.join(out_dir, 'inventory.bin'), sorted_inventory)
+
+
+def numpy_pipeline(csv_path, out_dir):
+    from inventory_numpy import (filter_dangerous_items_numpy, read_csv_numpy, save_binary_file_numpy,
+                                 save_csv_file_numpy, sort_flammability_numpy)
+
+    header, table = yield 'read_csv', read_csv_numpy, (csv_path,)
+    sorted_table = yield 'sort_flammability', sort_flammability_numpy, (table,)
+    dangerous_items = yield 'filter_dangerous_items', filter_dangerous_items_numpy, (sorted_table,)
+    yield 'save_csv_file', save_csv_file_numpy, (os.path.join(out_dir, 'danger.csv'), header, dangerous_items)
+    yield 'save_binary_file', save_binary_file_numpy, (os.path.join(out_dir, 'inventory.bin'), sorted_table)
+
+
+PIPELINES = {'loop': loop_pipeline, 'numpy': numpy_pipeline}
+
+
+def time_pipeline(pipeline, csv_path, out_dir, repeat):
+    # 파이프라인 전체를 repeat번 돌려 단계별 최소/중앙값 시간을 구한다. 한 번 잰 값은 캐시·스케줄링 잡음이 크다.
+    runs = [run_pipeline(pipeline, csv_path, out_dir, trace_memory=False) for _ in range(repeat)]
+    timings = {}
+    for stage in STAGES:
+        samples = sorted(run[stage] for run in runs)
+        timings[stage] = {'min': samples[0], 'median': samples[len(samples) // 2]}
+    return timings
+
+
+def run_pipeline(pipeline, csv_path, out_dir, trace_memory):
+    # 단계별 시간 또는 최대 메모리를 잰다. tracemalloc은 속도를 떨어뜨리므로 두 측정을 따로 돌린다.
+    measurements = {}
+    steps = pipeline(csv_path, out_dir)
+    result = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            while True:
+                stage, func, args = steps.send(result)
+                if trace_memory:
+                    tracemalloc.start()
+                    result = func(*args)
+                    measurements[stage] = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+                else:
+                    start = time.perf_counter()
+                    result = func(*args)
+                    measurements[stage] = time.perf_counter() - start
+        except StopIteration:
+            pass
+    return measurements
+
+
+def compare_results(previous, current, tolerance, noise_floor=0.005):
+    # 같은 (백엔드, 행 수, 단계)의 최소 시간이 tolerance 비율 이상, 그리고 noise_floor초 이상 늘어난 항목을 돌려준다.
+    # 아주 짧은 단계는 비율만 보면 잡음으로도 몇 배씩 달라지므로 절대 차이도 함께 본다.
+    baseline = {(r['backend'], r['rows'], r['stage']): r for r in previous['results']}
+    regressions = []
+    for r in current['results']:
+        old = baseline.get((r['backend'], r['rows'], r['stage']))
+        if old is None:
+            continue
+        if r['seconds'] > old['seconds'] * (1 + tolerance) and r['seconds'] - old['seconds'] >= noise_floor:
+            regressions.append((r, old))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='인벤토리 처리 단계별 벤치마크')
+    parser.add_argument('--min-exponent', type=int, default=3, choices=range(3, 9), metavar='{3..8}',
+                        help='가장 작은 행 수 10^n')
+    parser.add_argument('--max-exponent', type=int, default=6, choices=range(3, 9), metavar='{3..8}',
+                        help='가장 큰 행 수 10^n (최대 8)')
+    parser.add_argument('--backend', nargs='+', choices=list(PIPELINES), default=['loop'])
+    parser.add_argument('--no-memory', action='store_true', help='tracemalloc 측정을 생략')
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', help='이전 결과 파일과 비교하여 느려진 단계를 표시')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('--repeat', type=int, default=3, help='단계별 시간을 잴 반복 횟수 (최소값을 기록)')
+    parser.add_argument('--noise-floor', type=float, default=0.005,
+                        help='이 초보다 작게 늘어난 단계는 느려진 것으로 보지 않음')
+    args = parser.parse_args()
+    if args.min_exponent > args.max_exponent:
+        parser.error('--min-exponent는 --max-exponent보다 클 수 없습니다.')
+
+    report = {
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'results': [],
+    }
+
+    print(f'{"백엔드":<8}{"행 수":>12}  {"단계":<24}{"시간(s)":>10}{"행/s":>14}{"최대 메모리(MB)":>16}')
+    for exponent in range(args.min_exponent, args.max_exponent + 1):
+        rows = 10 ** exponent
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = os.path.join(tmp_dir, 'inventory.csv')
+            generate_inventory_csv(csv_path, rows)
+            for backend in args.backend:
+                times = time_pipeline(PIPELINES[backend], csv_path, tmp_dir, args.repeat)
+                peaks = {} if args.no_memory else run_pipeline(PIPELINES[backend], csv_path, tmp_dir, True)
+                for stage in STAGES:
+                    seconds = times[stage]['min']
+                    peak = peaks.get(stage)
+                    report['results'].append({
+                        'backend': backend,
+                        'rows': rows,
+                        'stage': stage,
+                        'seconds': seconds,
+                        'median_seconds': times[stage]['median'],
+                        'rows_per_second': rows / seconds if seconds else None,
+                        'peak_bytes': peak,
+                    })
+                    peak_text = '-' if peak is None else f'{peak / 1024 / 1024:.1f}'
+                    print(f'{backend:<8}{rows:>12,}  {stage:<24}{seconds:>10.3f}'
+                          f'{rows / seconds if seconds else 0:>14,.0f}{peak_text:>16}')
+
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    print(f'\n결과가 저장되었습니다: {args.output}')
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as file:
+            previous = json.load(file)
+        regressions = compare_results(previous, report, args.tolerance, args.noise_floor)
+        if not regressions:
+            print('느려진 단계가 없습니다.')
+        for r, old in regressions:
+            print(f"느려짐: {r['backend']} {r['rows']:,}행 {r['stage']} "
+                  f"{old['seconds']:.4f}s -> {r['seconds']:.4f}s")
+
+
+if __name__ == '__main__':
+    main()
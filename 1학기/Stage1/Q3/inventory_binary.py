@@ -0,0 +1,207 @@
+import math
+import mmap
+import struct
+import sys
+from array import array
+from itertools import accumulate
+
+# 파일 구조 (리틀 엔디언)
+#   헤더        : 매직(4) 버전(u16) 예약(u16) 레코드 수(u32) 값 종류 수(u32) 물질 이름 데이터 크기(u32) 값 원문 데이터 크기(u32)
+#   인화성      : f64[n]
+#   값 표       : 숫자 f64[값 종류 수] (숫자가 아니면 NaN)
+#   번호 열     : 무게 번호[n], 비중 번호[n], 강도 번호[n] (값 종류가 256개 이하면 u8, 65536개 이하면 u16, 아니면 u32)
+#   물질 이름   : 시작 위치[n + 1], UTF-8 데이터 (데이터가 64KiB 미만이면 위치는 u16, 아니면 u32)
+#   값 원문     : 시작 위치[값 종류 수 + 1], UTF-8 데이터 (위치 크기는 물질 이름과 같은 규칙)
+# 무게, 비중, 강도는 서로 다른 값마다 한 번씩만 값 표에 두고 행에는 그 번호만 적는다.
+# 숫자의 repr가 원문과 같은 값('0.789', '13.546')은 원문을 비워 두고,
+# 그렇지 않은 값('12', '1.050', 'Various', 'Very weak')만 원문을 남긴다.
+# 물질 이름은 행마다 다르므로 번호 없이 이어 붙인다. 구역마다 4바이트 경계에서 시작한다.
+MAGIC = b'MBIN'
+VERSION = 3
+HEADER = struct.Struct('<4sHHIIII')
+
+
+def _align(size, boundary=4):
+    return (size + boundary - 1) // boundary * boundary
+
+
+def _key_type(key_count):
+    return 'B' if key_count <= 1 << 8 else 'H' if key_count <= 1 << 16 else 'I'
+
+
+def _offset_type(blob_size):
+    return 'H' if blob_size < 1 << 16 else 'I'
+
+
+def _little_endian(column):
+    if sys.byteorder == 'big':
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column
+
+
+def _encode_texts(texts):
+    # 모두 ASCII면 글자 수가 곧 바이트 수이므로 한 번에 인코딩한다.
+    joined = ''.join(texts)
+    if joined.isascii():
+        lengths = map(len, texts)
+        blob = joined.encode('ascii')
+    else:
+        encoded = list(map(str.encode, texts))
+        lengths = map(len, encoded)
+        blob = b''.join(encoded)
+    return array(_offset_type(len(blob)), accumulate(lengths, initial=0)), blob
+
+
+class KeyTable(dict):
+    # 원문 → 번호. 처음 보는 원문만 __missing__에서 다음 번호를 받고, 그때 숫자와 남길 원문도 정한다.
+    # 이미 본 원문은 dict 조회 한 번으로 끝나므로 같은 값이 많을수록 빠르다.
+    def __init__(self):
+        super().__init__()
+        self.values = array('d')
+        self.stored_texts = []
+
+    def __missing__(self, text):
+        key = self[text] = len(self)
+        try:
+            value = float(text)
+        except ValueError:
+            value = math.nan
+        self.values.append(value)
+        # NaN의 repr는 'nan'이므로 원문 'nan'은 비우지 않는다. 비운 원문은 숫자가 있다는 뜻이다.
+        self.stored_texts.append('' if repr(value) == text and text != 'nan' else text)
+        return key
+
+
+def write_columns(file_path, substance_offsets, substance_blob, key_table, weight_keys, specific_gravity_keys,
+                  strength_keys, flammability):
+    # 번호 열과 flammability(array('d'))는 구역마다 한 번에 쓴다.
+    # inventory_numpy도 물질 이름을 직접 인코딩하고 KeyTable로 번호를 매긴 뒤 같은 함수로 쓴다.
+    key_type = _key_type(len(key_table))
+    text_offsets, text_blob = _encode_texts(key_table.stored_texts)
+
+    with open(file_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, 0, len(flammability), len(key_table),
+                               len(substance_blob), len(text_blob)))
+        _little_endian(flammability).tofile(file)
+        _little_endian(key_table.values).tofile(file)
+        for keys in (weight_keys, specific_gravity_keys, strength_keys):
+            _little_endian(array(key_type, keys)).tofile(file)
+        for offsets, blob in ((substance_offsets, substance_blob), (text_offsets, text_blob)):
+            file.write(b'\0' * (_align(file.tell()) - file.tell()))
+            _little_endian(offsets).tofile(file)
+            file.write(blob)
+
+
+def write_inventory_binary(file_path, inventory_list):
+    # 행을 한 번만 훑으며 세 값 열에 번호를 매긴다.
+    # 정렬된 목록은 행 객체가 메모리에 흩어져 있어 열마다 따로 훑는 것보다 한 번에 훑는 편이 빠르다.
+    keys = KeyTable()
+    substances, weight_keys, specific_gravity_keys, strength_keys, flammability = [], [], [], [], array('d')
+    add_substance, add_weight, add_specific_gravity, add_strength, add_flammability = (
+        substances.append, weight_keys.append, specific_gravity_keys.append, strength_keys.append,
+        flammability.append)
+    for substance, weight, specific_gravity, strength, value in inventory_list:
+        add_substance(substance)
+        add_weight(keys[weight])
+        add_specific_gravity(keys[specific_gravity])
+        add_strength(keys[strength])
+        add_flammability(value)
+    write_columns(file_path, *_encode_texts(substances), keys, weight_keys, specific_gravity_keys, strength_keys,
+                  flammability)
+
+
+class InventoryBinary:
+    # 파일을 mmap으로 열어 필요한 레코드나 열만 읽는다. 전체를 디코딩하지 않는다.
+    def __init__(self, file_path):
+        self.file = open(file_path, 'rb')
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, count, key_count, substance_size, text_size = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError('인벤토리 이진 파일 형식이 아닙니다.')
+        self.count = count
+        self.key_count = key_count
+        self._views = []
+
+        self.flammability_at = HEADER.size
+        values_at = self.flammability_at + 8 * count
+        self.values = self._view(values_at, key_count, 'd')
+        key_type = _key_type(key_count)
+        keys_at = values_at + 8 * key_count
+        key_size = array(key_type).itemsize
+        self.weight_keys = self._view(keys_at, count, key_type)
+        self.specific_gravity_keys = self._view(keys_at + key_size * count, count, key_type)
+        self.strength_keys = self._view(keys_at + 2 * key_size * count, count, key_type)
+
+        substance_type = _offset_type(substance_size)
+        substance_offsets_at = _align(keys_at + 3 * key_size * count)
+        self.substance_offsets = self._view(substance_offsets_at, count + 1, substance_type)
+        self.substance_at = substance_offsets_at + array(substance_type).itemsize * (count + 1)
+        text_type = _offset_type(text_size)
+        text_offsets_at = _align(self.substance_at + substance_size)
+        self.text_offsets = self._view(text_offsets_at, key_count + 1, text_type)
+        self.text_at = text_offsets_at + array(text_type).itemsize * (key_count + 1)
+
+    def _view(self, at, count, typecode):
+        # 구역 하나를 복사 없이 배열처럼 보여 준다 (리틀 엔디언 환경 기준).
+        view = memoryview(self.mm)[at:at + array(typecode).itemsize * count]
+        column = view.cast(typecode)
+        self._views.extend([column, view])
+        return column
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for view in self._views:
+            view.release()
+        self._views = []
+        if not self.mm.closed:
+            self.mm.close()
+        self.file.close()
+
+    def __len__(self):
+        return self.count
+
+    def text(self, key):
+        # 원문을 비워 둔 값은 숫자에서 원문을 다시 만든다.
+        start, end = self.text_offsets[key], self.text_offsets[key + 1]
+        value = self.values[key]
+        if start == end and not math.isnan(value):
+            return repr(value)
+        return self.mm[self.text_at + start:self.text_at + end].decode('utf-8')
+
+    def substance(self, i):
+        at = self.substance_at
+        return self.mm[at + self.substance_offsets[i]:at + self.substance_offsets[i + 1]].decode('utf-8')
+
+    def record(self, i):
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        flammability, = struct.unpack_from('<d', self.mm, self.flammability_at + 8 * i)
+        return (self.substance(i),
+                self.text(self.weight_keys[i]),
+                self.text(self.specific_gravity_keys[i]),
+                self.text(self.strength_keys[i]),
+                flammability)
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self.record(i)
+
+    def weight_column(self):
+        # 숫자가 아닌 무게는 NaN이다. 값 표에서 번호로 찾아 새 배열을 만든다.
+        return array('d', map(self.values.__getitem__, self.weight_keys))
+
+    def specific_gravity_column(self):
+        return array('d', map(self.values.__getitem__, self.specific_gravity_keys))
+
+    def flammability_column(self):
+        return self._view(self.flammability_at, self.count, 'd')
+
+    def find_flammable(self, threshold=0.7):
+        return [i for i, value in enumerate(self.flammability_column()) if value >= threshold]
@@ -0,0 +1,129 @@
+import bisect
+import heapq
+import mmap
+import os
+import struct
+from array import array
+
+from inventory_binary import InventoryBinary
+
+# 인화성 정렬 인덱스 파일 구조 (리틀 엔디언)
+#   헤더  : 매직(4) 레코드 수(u32) 원본 CSV 크기(u64) 수정 시각(ns, i64) 이진 파일 크기(u64) 수정 시각(ns, i64)
+#   값    : 인화성 f64[n] 오름차순
+#   위치  : 이진 파일(inventory_binary)에서의 레코드 번호 u32[n]
+# 행은 CSV를 파싱한 목록이 아니라 이진 파일의 레코드를 가리키므로, 질의할 때 CSV를 다시 읽지 않는다.
+MAGIC = b'MBFX'
+HEADER = struct.Struct('<4sIQqQq')
+INDEX_SUFFIX = '.flam.idx'
+
+
+def index_path_for(source_path):
+    return source_path + INDEX_SUFFIX
+
+
+def top_k(inventory_list, k):
+    # 인덱스 없이 한 번만 물어볼 때는 전체 정렬 대신 크기 k의 힙을 쓴다.
+    return heapq.nlargest(k, inventory_list, key=lambda x: x[4])
+
+
+def build_flammability_index(index_path, source_path, binary_path):
+    # 이진 파일의 인화성 열만 읽어 만든다.
+    # 같은 인화성끼리는 원래 순서가 유지되도록 (값, -행 번호)로 오름차순 정렬한다.
+    # 뒤에서부터 읽으면 sort_flammability(reverse=True)와 같은 순서가 된다.
+    with InventoryBinary(binary_path) as inventory:
+        column = inventory.flammability_column()
+        order = sorted(range(len(column)), key=lambda row: (column[row], -row))
+        values = array('d', (column[row] for row in order))
+    rows = array('I', order)
+    source = os.stat(source_path)
+    binary = os.stat(binary_path)
+    with open(index_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, len(order), source.st_size, source.st_mtime_ns,
+                               binary.st_size, binary.st_mtime_ns))
+        values.tofile(file)
+        rows.tofile(file)
+
+
+class FlammabilityIndex:
+    # mmap으로 연 인덱스 위에서 bisect하므로 질의마다 전체를 읽지 않는다.
+    # binary_path를 주면 records()가 행 번호를 그 파일의 레코드로 바꿔 준다.
+    def __init__(self, index_path, binary_path=None):
+        self.inventory = None
+        self.file = open(index_path, 'rb')
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, count, self.source_size, self.source_mtime_ns,
+         self.binary_size, self.binary_mtime_ns) = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError('인화성 인덱스 파일 형식이 아닙니다.')
+        self.count = count
+        values_at = HEADER.size
+        rows_at = values_at + 8 * count
+        self._raw = memoryview(self.mm)
+        self.values = self._raw[values_at:rows_at].cast('d')
+        self.rows = self._raw[rows_at:rows_at + 4 * count].cast('I')
+        if binary_path is not None:
+            try:
+                self.inventory = InventoryBinary(binary_path)
+            except Exception:
+                self.close()
+                raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.inventory is not None:
+            self.inventory.close()
+            self.inventory = None
+        if hasattr(self, '_raw'):
+            self.values.release()
+            self.rows.release()
+            self._raw.release()
+            del self._raw
+        if not self.mm.closed:
+            self.mm.close()
+        self.file.close()
+
+    def __len__(self):
+        return self.count
+
+    def matches(self, source_path, binary_path):
+        source = os.stat(source_path)
+        binary = os.stat(binary_path)
+        return (source.st_size == self.source_size and source.st_mtime_ns == self.source_mtime_ns
+                and binary.st_size == self.binary_size and binary.st_mtime_ns == self.binary_mtime_ns)
+
+    def descending(self):
+        return self.rows[::-1].tolist()
+
+    def at_least(self, threshold):
+        # 인화성이 threshold 이상인 행 번호를 인화성 내림차순으로 돌려준다.
+        position = bisect.bisect_left(self.values, threshold)
+        return self.rows[position:][::-1].tolist()
+
+    def top_k(self, k):
+        return self.rows[max(self.count - k, 0):][::-1].tolist()
+
+    def records(self, rows):
+        # 필요한 행만 이진 파일에서 꺼낸다.
+        return [self.inventory.record(row) for row in rows]
+
+
+def load_flammability_index(source_path, binary_path, write_binary):
+    # 원본 CSV나 이진 파일이 바뀌었거나 인덱스가 없으면 write_binary()로 이진 파일을 다시 쓰고 인덱스를 만든다.
+    # 둘 다 최신이면 CSV를 읽지 않는다.
+    index_path = index_path_for(source_path)
+    try:
+        index = FlammabilityIndex(index_path, binary_path)
+        if index.matches(source_path, binary_path) and len(index) == len(index.inventory):
+            return index
+        index.close()
+    except (FileNotFoundError, ValueError, struct.error):
+        pass
+    write_binary()
+    build_flammability_index(index_path, source_path, binary_path)
+    return FlammabilityIndex(index_path, binary_path)
@@ -0,0 +1,238 @@
+import csv
+import io
+from array import array
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from inventory_binary import KeyTable, _key_type, _offset_type, write_columns
+
+CHUNK_BYTES = 16 * 1024 * 1024
+SAVE_ROWS = 1 << 16
+COMMA, NEWLINE, QUOTE, RETURN = b',\n"\r'
+NUMERIC_START = np.frombuffer(b'0123456789+-.', dtype=np.uint8)
+# csv.writer가 따옴표로 감싸는 칸을 찾을 때 쓰는 바이트
+QUOTED_BYTES = np.frombuffer(b',"\r\n', dtype=np.uint8)
+
+# 글자 열은 UTF-8 바이트를 고정 폭(S) 배열로 둔다.
+# 파이썬 문자열 객체를 행마다 만들지 않으므로 정렬, 필터, 저장이 모두 배열 복사로 끝난다.
+
+
+def to_float_array(values):
+    # 전부 숫자면 한 번에 변환하고, 'Various'처럼 숫자로 시작하지 않는 값은 NaN으로 바꾼다.
+    try:
+        return values.astype(np.float64)
+    except ValueError:
+        pass
+    numeric = np.isin(values.astype('S1').view(np.uint8), NUMERIC_START)
+    cleaned = values.copy()
+    cleaned[~numeric] = b'nan'
+    try:
+        return cleaned.astype(np.float64)
+    except ValueError:
+        def convert(value):
+            try:
+                return float(value)
+            except ValueError:
+                return np.nan
+        return np.fromiter(map(convert, values.tolist()), dtype=np.float64, count=len(values))
+
+
+def cut_fields(padded, starts, ends):
+    # padded[starts[i]:ends[i]]를 한 칸씩 담은 고정 폭 바이트 배열을 만든다.
+    # padded는 가장 긴 칸만큼 0을 덧붙인 버퍼라서 어느 시작 위치든 폭만큼 잘라 올 수 있다.
+    lengths = ends - starts
+    width = max(int(lengths.max(initial=0)), 1)
+    cells = sliding_window_view(padded, width)[starts]
+    cells[np.arange(width) >= lengths[:, None]] = 0
+    return cells.view(f'S{width}').ravel()
+
+
+def split_quoted_chunk(chunk):
+    # 따옴표가 있는 묶음은 csv 모듈로 읽는다. 칸 안의 쉼표와 줄바꿈도 그대로 남는다.
+    rows = [row for row in csv.reader(io.StringIO(chunk.decode('utf-8'), newline='')) if len(row) == 5]
+    columns = zip(*rows) if rows else [()] * 5
+    return [np.array([field.encode('utf-8') for field in column], dtype=np.bytes_) for column in columns]
+
+
+def split_chunk(chunk):
+    # 따옴표가 없으면 쉼표와 줄바꿈 위치만으로 칸을 나눈다.
+    # 구분자가 5개(쉼표 4개와 줄 끝)가 아닌 줄은 기존 read_csv처럼 건너뛴다.
+    if QUOTE in chunk:
+        return split_quoted_chunk(chunk)
+    buffer = np.frombuffer(chunk, dtype=np.uint8)
+    delimiters = np.flatnonzero((buffer == COMMA) | (buffer == NEWLINE))
+    line_end = buffer[delimiters] == NEWLINE
+    if not chunk.endswith(b'\n'):
+        delimiters = np.append(delimiters, len(buffer))
+        line_end = np.append(line_end, True)
+    starts = np.concatenate(([0], delimiters[:-1] + 1))
+    line_ends = np.flatnonzero(line_end)
+    per_line = np.diff(line_ends, prepend=-1)
+    if not (per_line == 5).all():
+        keep = np.repeat(per_line == 5, per_line)
+        delimiters, starts = delimiters[keep], starts[keep]
+    starts, ends = starts.reshape(-1, 5), delimiters.reshape(-1, 5)
+    # '\r\n'으로 끝나는 줄의 '\r'은 마지막 칸에 넣지 않는다.
+    ends[:, 4] -= buffer[np.maximum(ends[:, 4] - 1, 0)] == RETURN
+    padded = np.concatenate([buffer, np.zeros(int((ends - starts).max(initial=0)) + 1, dtype=np.uint8)])
+    return [cut_fields(padded, starts[:, i], ends[:, i]) for i in range(5)]
+
+
+def field_cells(column):
+    # 고정 폭 바이트 배열을 (행, 폭) 바이트 표와 실제 글자 자리 표시로 바꾼다.
+    column = np.ascontiguousarray(column)
+    cells = column.view(np.uint8).reshape(len(column), column.itemsize)
+    return cells, np.arange(column.itemsize) < np.char.str_len(column)[:, None]
+
+
+def encode_column(column):
+    # inventory_binary._encode_texts와 같은 (시작 위치, UTF-8 데이터)를 배열 연산으로 만든다.
+    cells, used = field_cells(column)
+    blob = cells[used].tobytes()
+    offsets = np.zeros(len(column) + 1, dtype=np.int64)
+    np.cumsum(used.sum(axis=1), out=offsets[1:])
+    offset_type = _offset_type(len(blob))
+    return array(offset_type, offsets.astype(offset_type).tobytes()), blob
+
+
+class InventoryTable:
+    # 인벤토리를 열 단위 NumPy 배열로 보관한다.
+    # 무게와 비중은 저장용 원본 바이트 열을 두고, 계산용 float 열은 처음 쓸 때 만든다.
+    def __init__(self, substance, weight_text, specific_gravity_text, strength, flammability):
+        self.substance = substance
+        self.weight_text = weight_text
+        self.specific_gravity_text = specific_gravity_text
+        self.strength = strength
+        self.flammability = flammability
+        self._weight = None
+        self._specific_gravity = None
+
+    @property
+    def weight(self):
+        if self._weight is None:
+            self._weight = to_float_array(self.weight_text)
+        return self._weight
+
+    @property
+    def specific_gravity(self):
+        if self._specific_gravity is None:
+            self._specific_gravity = to_float_array(self.specific_gravity_text)
+        return self._specific_gravity
+
+    def __len__(self):
+        return len(self.flammability)
+
+    def take(self, positions):
+        table = InventoryTable.__new__(InventoryTable)
+        for name, column in vars(self).items():
+            setattr(table, name, None if column is None else column[positions])
+        return table
+
+    def text_columns(self):
+        # CSV에 쓰는 순서대로 다섯 열을 바이트 배열로 준다. 인화성은 repr와 같은 글자로 바꾼다.
+        # 실수를 글자로 바꾸는 비용이 크므로 서로 다른 값만 바꾼다. -0.0과 0.0은 비트 패턴으로 구분한다.
+        bits, inverse = np.unique(self.flammability.view(np.int64), return_inverse=True)
+        flammability_text = bits.view(np.float64).astype('S32')[inverse]
+        return [self.substance, self.weight_text, self.specific_gravity_text, self.strength, flammability_text]
+
+    def rows(self):
+        return zip(*(map(bytes.decode, column.tolist()) for column in self.text_columns()))
+
+
+def read_csv_numpy(file_path, chunk_bytes=CHUNK_BYTES):
+    # 줄 단위로 맞춘 chunk_bytes 크기의 묶음을 차례로 배열로 바꾼 뒤 이어 붙인다.
+    try:
+        with open(file_path, 'rb') as file:
+            header = next(csv.reader([file.readline().decode('utf-8')]))
+            chunks = []
+            while True:
+                parts = [file.read(chunk_bytes)]
+                if not parts[0]:
+                    break
+                parts.append(file.readline())
+                # 따옴표가 홀수 개면 칸 안의 줄바꿈에서 끊긴 것이므로 따옴표가 닫힐 때까지 줄을 더 읽는다.
+                open_quote = (parts[0].count(b'"') + parts[1].count(b'"')) % 2
+                while open_quote:
+                    line = file.readline()
+                    if not line:
+                        break
+                    parts.append(line)
+                    open_quote ^= line.count(b'"') % 2
+                chunks.append(split_chunk(b''.join(parts)))
+
+        if chunks:
+            columns = [np.concatenate(parts) for parts in zip(*chunks)]
+        else:
+            columns = [np.empty(0, dtype='S1') for _ in range(5)]
+        return header, InventoryTable(*columns[:4], to_float_array(columns[4]))
+    except FileNotFoundError:
+        print(f'\n오류: {file_path} 파일을 찾을 수 없습니다.')
+        return None, None
+    except Exception as e:
+        print(f'\n오류 발생: {e}')
+        return None, None
+
+
+def sort_flammability_numpy(table):
+    # 안정 정렬이므로 같은 인화성끼리는 sort_flammability와 같은 순서가 된다.
+    return table.take(np.argsort(-table.flammability, kind='stable'))
+
+
+def filter_dangerous_items_numpy(table, threshold=0.7):
+    return table.take(np.flatnonzero(table.flammability >= threshold))
+
+
+def csv_bytes(rows):
+    text = io.StringIO()
+    csv.writer(text, lineterminator='\n').writerows(rows)
+    return text.getvalue().encode('utf-8')
+
+
+def join_rows(columns):
+    # 칸 뒤에 쉼표나 줄바꿈을 붙인 (행, 폭) 표에서 글자 자리만 행 순서대로 모으면 CSV 본문이 된다.
+    cells, used = [], []
+    for i, column in enumerate(columns):
+        column_cells, column_used = field_cells(column)
+        separator = NEWLINE if i == len(columns) - 1 else COMMA
+        cells += [column_cells, np.full((len(column), 1), separator, dtype=np.uint8)]
+        used += [column_used, np.ones((len(column), 1), dtype=bool)]
+    return np.hstack(cells)[np.hstack(used)].tobytes()
+
+
+def save_csv_file_numpy(file_path, header, table):
+    # SAVE_ROWS 행씩 배열 연산으로 본문을 만든다.
+    # 쉼표, 따옴표, 줄바꿈이 든 칸이 있는 묶음만 csv.writer로 따옴표를 붙여 쓴다.
+    try:
+        with open(file_path, 'wb') as file:
+            file.write(csv_bytes([header]))
+            for start in range(0, len(table), SAVE_ROWS):
+                block = table.take(slice(start, start + SAVE_ROWS))
+                columns = block.text_columns()
+                if any(np.isin(column.view(np.uint8), QUOTED_BYTES).any() for column in columns[:4]):
+                    file.write(csv_bytes(block.rows()))
+                else:
+                    file.write(join_rows(columns))
+        print(f'\n위험 물질 목록이 저장되었습니다: {file_path}')
+    except Exception as e:
+        print(f'\n오류 발생: {e}')
+
+
+def save_binary_file_numpy(file_path, table):
+    # inventory_binary와 같은 형식이다. 무게, 비중, 강도를 이어 붙여 np.unique 한 번으로 번호를 매긴다.
+    try:
+        count = len(table)
+        texts = np.concatenate([table.weight_text, table.specific_gravity_text, table.strength])
+        key_texts, inverse = np.unique(texts, return_inverse=True)
+        # np.unique가 매긴 번호와 같은 순서로 값 표를 채운다. 서로 다른 값만 디코딩한다.
+        keys = KeyTable()
+        for text in key_texts.tolist():
+            keys[text.decode('utf-8')]
+        key_type = _key_type(len(keys))
+        inverse = inverse.astype(key_type)
+        key_columns = [array(key_type, inverse[i * count:(i + 1) * count].tobytes()) for i in range(3)]
+        write_columns(file_path, *encode_column(table.substance), keys, *key_columns,
+                      array('d', table.flammability.tobytes()))
+        print(f'\n이진 파일이 저장되었습니다: {file_path}')
+    except Exception as e:
+        print(f'\n오류 발생: {e}')
@@ -1,3 +1,22 @@
+import argparse
+
+from inventory_binary import InventoryBinary, write_inventory_binary
+from inventory_index import load_flammability_index
+
+
+def read_header(file_path):
+    # 인덱스가 최신이면 CSV 전체 대신 머리글 한 줄만 읽는다.
+    try:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            return file.readline().strip().split(',')
+    except FileNotFoundError:
+        print(f'\n오류: {file_path} 파일을 찾을 수 없습니다.')
+        return None
+    except Exception as e:
+        print(f'\n오류 발생: {e}')
+        return None
+
+
 def read_csv(file_path):
     try:
         with open(file_path, 'r', encoding='utf-8') as file:
@@ -29,6 +48,11 @@ def filter_dangerous_items(inventory_list, threshold=0.7):
     return [item for item in inventory_list if item[4] >= threshold]
 
 
+def query_dangerous_items(index, threshold=0.7):
+    # 정렬 인덱스를 쓰므로 기준값이 바뀌어도 다시 정렬하지 않고, 찾은 행만 이진 파일에서 읽는다.
+    return index.records(index.at_least(threshold))
+
+
 def save_csv_file(file_path, header, inventory_list):
     try:
         with open(file_path, 'w', encoding='utf-8') as file:
@@ -42,10 +66,7 @@ def save_csv_file(file_path, header, inventory_list):
 
 def save_binary_file(file_path, inventory_list):
     try:
-        with open(file_path, 'wb') as file:
-            for item in inventory_list:
-                line = f'{item[0]},{item[1]},{item[2]},{item[3]},{item[4]}\n'
-                file.write(line.encode('utf-8'))
+        write_inventory_binary(file_path, inventory_list)
         print(f'\n이진 파일이 저장되었습니다: {file_path}')
     except Exception as e:
         print(f'\n오류 발생: {e}')
@@ -53,17 +74,25 @@ def save_binary_file(file_path, inventory_list):
 
 def read_binary_file(file_path):
     try:
-        with open(file_path, 'rb') as file:
-            content = file.read().decode('utf-8')
+        with InventoryBinary(file_path) as inventory:
             print('\n저장된 이진 파일 내용')
-            print(content)
+            for item in inventory:
+                print(f'{item[0]},{item[1]},{item[2]},{item[3]},{item[4]}')
     except FileNotFoundError:
         print(f'\n오류: {file_path} 파일을 찾을 수 없습니다.')
     except Exception as e:
         print(f'\n오류 발생: {e}')
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description='Mars Base Inventory List 처리')
+    parser.add_argument('--backend', choices=['loop', 'numpy'], default='loop',
+                        help='numpy를 고르면 열 단위 배열로 읽고 정렬, 필터, 저장을 배열 연산으로 처리')
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
 
     print('Mars Base Inventory List 처리 시작')
 
@@ -71,14 +100,39 @@ def main():
     danger_csv_file = 'Mars_Base_Inventory_danger.csv'
     binary_file = 'Mars_Base_Inventory_List.bin'
 
-    header, inventory_list = read_csv(csv_file)
-
-    if inventory_list is not None:
-        sorted_inventory = sort_flammability(inventory_list)
-        dangerous_items = filter_dangerous_items(sorted_inventory)
-        save_csv_file(danger_csv_file, header, dangerous_items)
-        save_binary_file(binary_file, sorted_inventory)
-        read_binary_file(binary_file)
+    if args.backend == 'numpy':
+        from inventory_numpy import (filter_dangerous_items_numpy, read_csv_numpy, save_binary_file_numpy,
+                                     save_csv_file_numpy, sort_flammability_numpy)
+
+        header, table = read_csv_numpy(csv_file)
+        if table is not None:
+            sorted_table = sort_flammability_numpy(table)
+            save_csv_file_numpy(danger_csv_file, header, filter_dangerous_items_numpy(sorted_table))
+            save_binary_file_numpy(binary_file, sorted_table)
+            read_binary_file(binary_file)
+        return
+
+    header = read_header(csv_file)
+
+    def write_sorted_binary():
+        # CSV나 이진 파일이 바뀌었을 때만 CSV 전체를 읽어 정렬된 이진 파일을 다시 쓴다.
+        # CSV를 읽지 못하거나 쓰기에 실패하면 예외를 올려 인덱스를 만들지 않는다.
+        _, inventory_list = read_csv(csv_file)
+        if inventory_list is None:
+            raise ValueError(f'{csv_file} 파일을 읽을 수 없습니다.')
+        write_inventory_binary(binary_file, sort_flammability(inventory_list))
+        print(f'\n이진 파일이 저장되었습니다: {binary_file}')
+
+    if header is None:
+        return
+    try:
+        with load_flammability_index(csv_file, binary_file, write_sorted_binary) as index:
+            dangerous_items = query_dangerous_items(index)
+    except Exception as e:
+        print(f'\n오류 발생: {e}')
+        return
+    save_csv_file(danger_csv_file, header, dangerous_items)
+    read_binary_file(binary_file)
 
 if __name__ == '__main__':
     main()
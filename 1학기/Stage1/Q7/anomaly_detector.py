@@ -0,0 +1,106 @@
+import math
+
+import numpy as np
+
+# 항목별 규칙: EWMA 가중치, z-score 기준, 초당 최대 변화량(None이면 검사하지 않음)
+DEFAULT_RULES = {
+    'mars_base_internal_temperature': {'alpha': 0.05, 'z_threshold': 4.0, 'max_rate': None},
+    'mars_base_external_temperature': {'alpha': 0.05, 'z_threshold': 4.0, 'max_rate': None},
+    'mars_base_internal_humidity': {'alpha': 0.05, 'z_threshold': 4.0, 'max_rate': None},
+    'mars_base_external_illuminance': {'alpha': 0.05, 'z_threshold': 4.0, 'max_rate': None},
+    'mars_base_internal_co2': {'alpha': 0.05, 'z_threshold': 4.0, 'max_rate': 0.02},
+    'mars_base_internal_oxygen': {'alpha': 0.05, 'z_threshold': 4.0, 'max_rate': 1.0},
+}
+WARMUP_SAMPLES = 20
+
+
+class ChannelDetector:
+    # 지수 가중 평균과 분산을 유지하며 값 하나당 상수 시간에 z-score와 변화율을 검사한다.
+    def __init__(self, alpha, z_threshold, max_rate=None, warmup=WARMUP_SAMPLES):
+        self.alpha = alpha
+        self.z_threshold = z_threshold
+        self.max_rate = max_rate
+        self.warmup = warmup
+        self.count = 0
+        self.mean = 0.0
+        self.variance = 0.0
+        self.last_value = None
+        self.last_time = None
+
+    def update(self, timestamp, value):
+        # 규칙에 걸리면 (규칙 이름, 점수) 목록을 돌려준다. 점수를 본 뒤에 통계를 갱신한다.
+        alerts = []
+        if self.count >= self.warmup and self.variance > 0:
+            z = (value - self.mean) / math.sqrt(self.variance)
+            if abs(z) > self.z_threshold:
+                alerts.append(('z_score', z))
+        if self.max_rate is not None and self.last_time is not None and timestamp > self.last_time:
+            rate = (value - self.last_value) / (timestamp - self.last_time)
+            if abs(rate) > self.max_rate:
+                alerts.append(('rate_of_change', rate))
+
+        if self.count == 0:
+            self.mean = value
+        else:
+            delta = value - self.mean
+            self.mean += self.alpha * delta
+            self.variance = (1 - self.alpha) * (self.variance + self.alpha * delta * delta)
+        self.count += 1
+        self.last_value = value
+        self.last_time = timestamp
+        return alerts
+
+
+class AnomalyDetector:
+    # 경보는 on_alert 콜백을 부르거나, alert_queue(queue.Queue 또는 asyncio.Queue)에 넣어 보낸다.
+    # 통계는 (센서, 항목)마다 따로 두므로 여러 센서의 값이 한 평균에 섞이지 않는다.
+    def __init__(self, rules=None, on_alert=None, alert_queue=None):
+        self.rules = rules or DEFAULT_RULES
+        self.detectors = {}
+        self.on_alert = on_alert
+        self.alert_queue = alert_queue
+        self.alert_count = 0
+
+    def _emit(self, alert):
+        self.alert_count += 1
+        if self.on_alert is not None:
+            self.on_alert(alert)
+        if self.alert_queue is not None:
+            self.alert_queue.put_nowait(alert)
+
+    def detector_for(self, sensor, channel):
+        key = (sensor, channel)
+        detector = self.detectors.get(key)
+        if detector is None:
+            detector = self.detectors[key] = ChannelDetector(**self.rules[channel])
+        return detector
+
+    def update(self, timestamp, reading, sensor=None):
+        for channel in self.rules:
+            value = reading.get(channel)
+            if value is None:
+                continue
+            for rule, score in self.detector_for(sensor, channel).update(timestamp, value):
+                self._emit({'sensor': sensor, 'timestamp': timestamp, 'channel': channel,
+                            'rule': rule, 'value': value, 'score': score})
+
+    def update_batch(self, timestamps, readings, sensor=None):
+        # set_env_batch가 돌려준 구조화 배열을 항목별로 한 줄씩 훑는다.
+        # 경보는 모았다가 시간순으로 내보내므로 update()를 한 번씩 부른 것과 같은 순서가 된다.
+        timestamps = np.asarray(timestamps, dtype=np.float64).tolist()
+        alerts = []
+        for channel in self.rules:
+            if channel not in readings.dtype.names:
+                continue
+            detector = self.detector_for(sensor, channel)
+            for timestamp, value in zip(timestamps, readings[channel].tolist()):
+                for rule, score in detector.update(timestamp, value):
+                    alerts.append({'sensor': sensor, 'timestamp': timestamp, 'channel': channel,
+                                   'rule': rule, 'value': value, 'score': score})
+        alerts.sort(key=lambda alert: alert['timestamp'])
+        for alert in alerts:
+            self._emit(alert)
+
+    def sink(self, name, timestamp, reading):
+        # SensorScheduler의 싱크로 쓸 수 있다.
+        self.update(timestamp, reading, sensor=name)
@@ -0,0 +1,44 @@
+import argparse
+import asyncio
+import time
+
+from dummy_sensor import DummySensor
+from running_stats import MultiWindowStats
+from sensor_scheduler import SensorScheduler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='asyncio 센서 스케줄러 처리량 측정')
+    parser.add_argument('--sensors', type=int, default=2000)
+    parser.add_argument('--interval', type=float, default=0.1, help='센서별 측정 주기(초)')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--overflow', choices=['block', 'drop_oldest', 'drop_new'], default='block')
+    args = parser.parse_args()
+
+    stats = {}
+
+    def stats_sink(name, timestamp, reading):
+        windows = stats.get(name)
+        if windows is None:
+            windows = stats[name] = MultiWindowStats({'1분': 60}, args.interval)
+        windows.add(reading['mars_base_internal_co2'])
+
+    scheduler = SensorScheduler(sinks=[stats_sink], overflow=args.overflow)
+    for i in range(args.sensors):
+        scheduler.add_sensor(f'sensor-{i}', DummySensor(seed=i), args.interval)
+
+    start = time.perf_counter()
+    asyncio.run(scheduler.run(args.duration))
+    elapsed = time.perf_counter() - start
+
+    target = args.sensors / args.interval
+    print(f'센서 {args.sensors}개, 주기 {args.interval}s, {elapsed:.1f}s 동안')
+    print(f'  목표 처리량  : {target:,.0f} 측정/s')
+    print(f'  생성         : {scheduler.produced / elapsed:,.0f} 측정/s')
+    print(f'  전달         : {scheduler.delivered / elapsed:,.0f} 측정/s')
+    print(f'  버림         : {scheduler.dropped}')
+    print(f'  싱크 오류    : {scheduler.sink_errors}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,26 @@
 import random
 import time
 
+import numpy as np
+
+# 센서 항목별 (최소값, 최대값, 소수점 자리수)
+SENSOR_RANGES = {
+    'mars_base_internal_temperature': (18, 30, 2),
+    'mars_base_external_temperature': (0, 21, 2),
+    'mars_base_internal_humidity': (50, 60, 2),
+    'mars_base_external_illuminance': (500, 715, 2),
+    'mars_base_internal_co2': (0.02, 0.1, 3),
+    'mars_base_internal_oxygen': (4, 7, 2),
+}
+READING_DTYPE = np.dtype([(key, np.float64) for key in SENSOR_RANGES])
+
 class DummySensor:
-    def __init__(self):
+    def __init__(self, seed=None, log_writer=None, binary_log=None):
+        self.rng = np.random.default_rng(seed)
+        # 측정값 하나를 뽑을 때는 NumPy 스칼라 호출보다 표준 난수기가 훨씬 빠르다.
+        self.py_rng = random.Random(seed)
+        self.log_writer = log_writer
+        self.binary_log = binary_log
         self.env_values = {
             'mars_base_internal_temperature': None,
             'mars_base_external_temperature': None,
@@ -13,14 +31,19 @@ class DummySensor:
         }
 
     def set_env(self):
-        self.env_values['mars_base_internal_temperature'] = round(random.uniform(18, 30), 2)
-        self.env_values['mars_base_external_temperature'] = round(random.uniform(0, 21), 2)
-        self.env_values['mars_base_internal_humidity'] = round(random.uniform(50, 60), 2)
-        self.env_values['mars_base_external_illuminance'] = round(random.uniform(500, 715), 2)
-        self.env_values['mars_base_internal_co2'] = round(random.uniform(0.02, 0.1), 3)
-        self.env_values['mars_base_internal_oxygen'] = round(random.uniform(4, 7), 2)
+        for key, (low, high, digits) in SENSOR_RANGES.items():
+            self.env_values[key] = round(self.py_rng.uniform(low, high), digits)
+
+    def set_env_batch(self, n):
+        # n개의 측정값을 항목별로 한 번에 만들어 구조화 배열로 돌려준다.
+        readings = np.empty(n, dtype=READING_DTYPE)
+        for key, (low, high, digits) in SENSOR_RANGES.items():
+            readings[key] = np.round(self.rng.uniform(low, high, n), digits)
+        return readings
 
     def get_env(self):
+        if self.binary_log is not None:
+            self.binary_log.write(time.time(), self.env_values)
         now = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
         log_line = (
             f"현재 시간: {now}\n"
@@ -32,6 +55,9 @@ class DummySensor:
             f"  화성 기지 내부 산소 농도: {self.env_values['mars_base_internal_oxygen']}%\n"
             f"{'-' * 50}\n"
         )
-        with open("sensor_log.txt", "a", encoding="utf-8") as log_file:
-            log_file.write(log_line)
+        if self.log_writer is not None:
+            self.log_writer.write(log_line)
+        else:
+            with open("sensor_log.txt", "a", encoding="utf-8") as log_file:
+                log_file.write(log_line)
         return self.env_values
@@ -1,14 +1,31 @@
 import threading
 import time
+from anomaly_detector import AnomalyDetector
 from dummy_sensor import DummySensor
+from running_stats import MultiWindowStats
+from sensor_history import SensorHistoryStore
+from sensor_log_writer import SensorLogWriter
+
+SAMPLE_INTERVAL = 5
+# 로그는 1분(측정 12번)마다 모아서 쓴다. 한 번 측정한 로그가 약 400바이트라 크기 기준에는 먼저 닿지 않는다.
+LOG_FLUSH_INTERVAL = 60
+LOG_BUFFER_BYTES = 16 * 1024
+# 통계 구간 이름과 길이(초)
+STAT_WINDOWS = {'5분': 5 * 60, '1시간': 60 * 60, '24시간': 24 * 60 * 60}
 
 class MissionComputer:
 
-    def __init__(self):
-        self.ds = DummySensor()
+    def __init__(self, on_stats=None):
+        # on_stats(stats)는 값이 들어와 구간별 통계가 갱신될 때마다 불린다. (예: Q8 메트릭 서버로 내보내기)
+        self.on_stats = on_stats
+        self.log_writer = SensorLogWriter("sensor_log.txt", buffer_bytes=LOG_BUFFER_BYTES,
+                                          flush_interval=LOG_FLUSH_INTERVAL)
+        self.ds = DummySensor(log_writer=self.log_writer)
+        self.history = SensorHistoryStore("sensor_history.db", batch_size=60)
+        self.detector = AnomalyDetector(on_alert=self._print_alert)
         self.stop_flag = False
         self.iteration_count = 0
-        self.accumulated = {key: [] for key in self.ds.env_values}
+        self.stats = {key: MultiWindowStats(STAT_WINDOWS, SAMPLE_INTERVAL) for key in self.ds.env_values}
 
     def _input_thread(self):
         while True:
@@ -17,56 +34,85 @@ class MissionComputer:
                 self.stop_flag = True
                 break
 
-    def get_sensor_data(self):
-        input_thread = threading.Thread(target=self._input_thread)
-        input_thread.daemon = True
-        input_thread.start()
-
-        while not self.stop_flag:
-            self.ds.set_env()
-            sensor_data = self.ds.get_env()
-            self.ds.env_values = sensor_data.copy()
+    def _print_alert(self, alert):
+        rule = "급격한 변화" if alert["rule"] == "rate_of_change" else "평소 범위 이탈"
+        print(f"[경보] {alert['channel']}: {rule} (값 {alert['value']}, 점수 {alert['score']:.3f})")
 
-            timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+    def format_window_stats(self):
+        lines = ["********** 구간별 통계 (평균 / 최소 / 최대 / 표준편차) **********"]
+        for name in STAT_WINDOWS:
+            lines.append(f"[{name}]")
+            for key, stats in self.stats.items():
+                window = stats[name]
+                lines.append(f"  {key}: {window.mean:.2f} / {window.min:.2f} / "
+                             f"{window.max:.2f} / {window.std:.3f} ({window.count}개)")
+        return "\n".join(lines)
 
-            output = (
-                "============================================\n"
-                "       센서 데이터 출력\n"
-                "============================================\n"
-                f"현재 시간: {timestamp}\n"
-                f"화성 기지 내부 온도      : {self.ds.env_values['mars_base_internal_temperature']} °C\n"
-                f"화성 기지 외부 온도      : {self.ds.env_values['mars_base_external_temperature']} °C\n"
-                f"화성 기지 내부 습도      : {self.ds.env_values['mars_base_internal_humidity']} %\n"
-                f"화성 기지 외부 광량      : {self.ds.env_values['mars_base_external_illuminance']} W/m2\n"
-                f"화성 기지 내부 이산화탄소: {self.ds.env_values['mars_base_internal_co2']} %\n"
-                f"화성 기지 내부 산소      : {self.ds.env_values['mars_base_internal_oxygen']} %\n"
-                "============================================\n"
-            )
-            print(output)
+    def get_sensor_data(self, stop_event=None):
+        # stop_event를 주면 입력 대신 그 이벤트로 멈춘다. (다른 프로그램의 스레드에서 돌릴 때)
+        if stop_event is None:
+            input_thread = threading.Thread(target=self._input_thread)
+            input_thread.daemon = True
+            input_thread.start()
 
-            for key, value in self.ds.env_values.items():
-                self.accumulated[key].append(value)
+        # Ctrl+C로 끝나도 아직 쓰지 못한 로그와 기록 묶음을 남기도록 항상 닫는다.
+        try:
+            while not self.stop_flag and not (stop_event is not None and stop_event.is_set()):
+                self.ds.set_env()
+                sensor_data = self.ds.get_env()
+                self.ds.env_values = sensor_data.copy()
 
-            self.iteration_count += 1
+                timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
 
-            if self.iteration_count % 60 == 0:
-                avg_values = {}
-                for key, readings in self.accumulated.items():
-                    avg_values[key] = round(sum(readings) / len(readings), 2)
-                avg_output = (
-                    "\n********** 5분 평균 값 **********\n"
-                    f"화성 기지 내부 온도      : {avg_values['mars_base_internal_temperature']} °C\n"
-                    f"화성 기지 외부 온도      : {avg_values['mars_base_external_temperature']} °C\n"
-                    f"화성 기지 내부 습도      : {avg_values['mars_base_internal_humidity']} %\n"
-                    f"화성 기지 외부 광량      : {avg_values['mars_base_external_illuminance']} W/m2\n"
-                    f"화성 기지 내부 이산화탄소: {avg_values['mars_base_internal_co2']} %\n"
-                    f"화성 기지 내부 산소      : {avg_values['mars_base_internal_oxygen']} %\n"
-                    "********************************\n"
+                output = (
+                    "============================================\n"
+                    "       센서 데이터 출력\n"
+                    "============================================\n"
+                    f"현재 시간: {timestamp}\n"
+                    f"화성 기지 내부 온도      : {self.ds.env_values['mars_base_internal_temperature']} °C\n"
+                    f"화성 기지 외부 온도      : {self.ds.env_values['mars_base_external_temperature']} °C\n"
+                    f"화성 기지 내부 습도      : {self.ds.env_values['mars_base_internal_humidity']} %\n"
+                    f"화성 기지 외부 광량      : {self.ds.env_values['mars_base_external_illuminance']} W/m2\n"
+                    f"화성 기지 내부 이산화탄소: {self.ds.env_values['mars_base_internal_co2']} %\n"
+                    f"화성 기지 내부 산소      : {self.ds.env_values['mars_base_internal_oxygen']} %\n"
+                    "============================================\n"
                 )
-                print(avg_output)
-                self.accumulated = {key: [] for key in self.ds.env_values}
-            time.sleep(5)
+                print(output)
+
+                for key, value in self.ds.env_values.items():
+                    self.stats[key].add(value)
+                if self.on_stats is not None:
+                    try:
+                        self.on_stats(self.stats)
+                    except Exception as e:
+                        print(f"통계 콜백 오류: {e!r}")
+                now = time.time()
+                self.history.add("mars_base", now, self.ds.env_values)
+                self.detector.update(now, self.ds.env_values)
+
+                self.iteration_count += 1
 
+                if self.iteration_count % 60 == 0:
+                    avg_values = {key: round(stats['5분'].mean, 2) for key, stats in self.stats.items()}
+                    avg_output = (
+                        "\n********** 5분 평균 값 **********\n"
+                        f"화성 기지 내부 온도      : {avg_values['mars_base_internal_temperature']} °C\n"
+                        f"화성 기지 외부 온도      : {avg_values['mars_base_external_temperature']} °C\n"
+                        f"화성 기지 내부 습도      : {avg_values['mars_base_internal_humidity']} %\n"
+                        f"화성 기지 외부 광량      : {avg_values['mars_base_external_illuminance']} W/m2\n"
+                        f"화성 기지 내부 이산화탄소: {avg_values['mars_base_internal_co2']} %\n"
+                        f"화성 기지 내부 산소      : {avg_values['mars_base_internal_oxygen']} %\n"
+                        "********************************\n"
+                    )
+                    print(avg_output)
+                    print(self.format_window_stats())
+                if stop_event is not None:
+                    stop_event.wait(SAMPLE_INTERVAL)
+                else:
+                    time.sleep(SAMPLE_INTERVAL)
+        finally:
+            self.log_writer.close()
+            self.history.close()
         print("시스템 종료….")
 
 
@@ -0,0 +1,83 @@
+import math
+from array import array
+from collections import deque
+
+
+class SlidingWindowStats:
+    # 최근 size개 값의 평균, 분산, 최소, 최대를 값 하나당 상수 시간에 갱신한다.
+    # 값은 고정 크기 링 버퍼에 두고, 평균과 분산은 Welford 방식으로 더하고 빼며,
+    # 최소와 최대는 단조 덱으로 관리한다.
+    def __init__(self, size):
+        self.size = size
+        self.ring = array('d', bytes(8 * size))
+        self.seq = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min_deque = deque()
+        self.max_deque = deque()
+
+    def add(self, value):
+        slot = self.seq % self.size
+        if self.count == self.size:
+            old = self.ring[slot]
+            self.count -= 1
+            if self.count:
+                delta = old - self.mean
+                self.mean -= delta / self.count
+                self.m2 -= delta * (old - self.mean)
+            else:
+                self.mean = self.m2 = 0.0
+        self.ring[slot] = value
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+        oldest = self.seq - self.size
+        while self.min_deque and self.min_deque[-1][1] >= value:
+            self.min_deque.pop()
+        self.min_deque.append((self.seq, value))
+        if self.min_deque[0][0] <= oldest:
+            self.min_deque.popleft()
+        while self.max_deque and self.max_deque[-1][1] <= value:
+            self.max_deque.pop()
+        self.max_deque.append((self.seq, value))
+        if self.max_deque[0][0] <= oldest:
+            self.max_deque.popleft()
+        self.seq += 1
+
+    @property
+    def min(self):
+        return self.min_deque[0][1] if self.count else None
+
+    @property
+    def max(self):
+        return self.max_deque[0][1] if self.count else None
+
+    @property
+    def variance(self):
+        return max(self.m2, 0.0) / self.count if self.count else None
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance) if self.count else None
+
+    def snapshot(self):
+        return {'count': self.count, 'mean': self.mean if self.count else None,
+                'min': self.min, 'max': self.max, 'variance': self.variance}
+
+
+class MultiWindowStats:
+    # 여러 길이의 구간(예: 5분, 1시간, 24시간)을 동시에 유지한다.
+    # windows는 {이름: 초}이고, interval초마다 값이 하나씩 들어온다고 보고 링 버퍼 크기를 정한다.
+    def __init__(self, windows, interval):
+        self.windows = {name: SlidingWindowStats(max(1, int(seconds // interval)))
+                        for name, seconds in windows.items()}
+
+    def add(self, value):
+        for window in self.windows.values():
+            window.add(value)
+
+    def __getitem__(self, name):
+        return self.windows[name]
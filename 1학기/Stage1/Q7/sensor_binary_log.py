@@ -0,0 +1,132 @@
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+from dummy_sensor import SENSOR_RANGES
+
+# 파일 구조 (리틀 엔디언): 헤더 8바이트(매직 4 + 버전 u16 + 예약 u16) 뒤에
+# 32바이트 레코드(측정 시각 epoch f64 + 센서 6개 f32)가 계속 덧붙는다.
+MAGIC = b'MSLG'
+VERSION = 1
+HEADER = MAGIC + VERSION.to_bytes(2, 'little') + bytes(2)
+RECORD_DTYPE = np.dtype([('timestamp', '<f8')] + [(key, '<f4') for key in SENSOR_RANGES])
+
+# sensor_log.txt의 한 줄 이름 → 센서 항목
+TEXT_LABELS = {
+    '화성 기지 내부 온도': 'mars_base_internal_temperature',
+    '화성 기지 외부 온도': 'mars_base_external_temperature',
+    '화성 기지 내부 습도': 'mars_base_internal_humidity',
+    '화성 기지 외부 광량': 'mars_base_external_illuminance',
+    '화성 기지 내부 이산화탄소 농도': 'mars_base_internal_co2',
+    '화성 기지 내부 산소 농도': 'mars_base_internal_oxygen',
+}
+TEXT_LINE = re.compile(r'\s*(.+?):\s*(-?[\d.]+)')
+
+
+class SensorBinaryWriter:
+    # 레코드를 파일 끝에 덧붙이기만 한다. 이전에 쓰다 끊긴 마지막 레코드는 열 때 잘라 낸다.
+    def __init__(self, file_path='sensor_log.bin'):
+        self.file_path = file_path
+        exists = os.path.exists(file_path) and os.path.getsize(file_path) >= len(HEADER)
+        self.file = open(file_path, 'r+b' if exists else 'wb')
+        if exists:
+            if self.file.read(len(HEADER)) != HEADER:
+                self.file.close()
+                raise ValueError(f'센서 이진 로그 형식이 아닙니다: {file_path}')
+            size = os.path.getsize(file_path)
+            whole = len(HEADER) + (size - len(HEADER)) // RECORD_DTYPE.itemsize * RECORD_DTYPE.itemsize
+            self.file.truncate(whole)
+            self.file.seek(whole)
+        else:
+            self.file.write(HEADER)
+
+    def write(self, timestamp, env_values):
+        record = np.empty(1, dtype=RECORD_DTYPE)
+        record['timestamp'] = timestamp
+        for key in SENSOR_RANGES:
+            record[key] = env_values[key]
+        self.file.write(record.tobytes())
+
+    def write_batch(self, timestamps, readings):
+        # set_env_batch가 돌려준 구조화 배열을 한 번에 덧붙인다.
+        records = np.empty(len(readings), dtype=RECORD_DTYPE)
+        records['timestamp'] = timestamps
+        for key in SENSOR_RANGES:
+            records[key] = readings[key]
+        self.write_records(records)
+
+    def write_records(self, records):
+        self.file.write(np.asarray(records, dtype=RECORD_DTYPE).tobytes())
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_sensor_log(file_path):
+    # 파일을 mmap한 구조화 배열을 돌려준다. records['mars_base_internal_co2']처럼 열을 바로 꺼낼 수 있다.
+    with open(file_path, 'rb') as file:
+        if file.read(len(HEADER)) != HEADER:
+            raise ValueError(f'센서 이진 로그 형식이 아닙니다: {file_path}')
+    count = (os.path.getsize(file_path) - len(HEADER)) // RECORD_DTYPE.itemsize
+    if count == 0:
+        return np.empty(0, dtype=RECORD_DTYPE)
+    return np.memmap(file_path, dtype=RECORD_DTYPE, mode='r', offset=len(HEADER), shape=(count,))
+
+
+def parse_text_log(text_path):
+    # sensor_log.txt의 '현재 시간' 블록을 (epoch, 측정값 dict) 목록으로 바꾼다.
+    readings = []
+    current = None
+    with open(text_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            if line.startswith('현재 시간:'):
+                stamp = line.split(':', 1)[1].strip()
+                current = {'timestamp': time.mktime(time.strptime(stamp, '%Y-%m-%d %H:%M:%S'))}
+                continue
+            match = TEXT_LINE.match(line)
+            if current is None or not match or match.group(1) not in TEXT_LABELS:
+                continue
+            current[TEXT_LABELS[match.group(1)]] = float(match.group(2))
+            if len(current) == len(SENSOR_RANGES) + 1:
+                readings.append(current)
+                current = None
+    return readings
+
+
+def convert_text_log(text_path, binary_path):
+    readings = parse_text_log(text_path)
+    records = np.empty(len(readings), dtype=RECORD_DTYPE)
+    for name in RECORD_DTYPE.names:
+        records[name] = [reading[name] for reading in readings]
+    with SensorBinaryWriter(binary_path) as writer:
+        writer.write_records(records)
+    return len(readings)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 4 and sys.argv[1] == 'convert':
+        count = convert_text_log(sys.argv[2], sys.argv[3])
+        print(f'{count}개의 측정값을 변환했습니다: {sys.argv[3]}')
+    elif len(sys.argv) == 3 and sys.argv[1] == 'show':
+        records = read_sensor_log(sys.argv[2])
+        print(f'측정값 {len(records)}개')
+        for key in SENSOR_RANGES:
+            if len(records):
+                print(f'{key}: 평균 {records[key].mean():.3f}, 최소 {records[key].min():.3f}, '
+                      f'최대 {records[key].max():.3f}')
+    else:
+        print('사용법: python sensor_binary_log.py convert sensor_log.txt sensor_log.bin')
+        print('        python sensor_binary_log.py show sensor_log.bin')
@@ -0,0 +1,116 @@
+import sqlite3
+import time
+
+# 계층 이름: (버킷 길이 초, 보존 기간 초). raw는 원본 측정값이다.
+TIERS = {
+    'raw': (None, 60 * 60),
+    '1m': (60, 7 * 24 * 60 * 60),
+    '1h': (60 * 60, 90 * 24 * 60 * 60),
+    '1d': (24 * 60 * 60, 5 * 365 * 24 * 60 * 60),
+}
+
+
+class SensorHistoryStore:
+    # 원본 측정값은 짧게 보관하고, 1분/1시간/1일 단위 집계(개수, 합, 최소, 최대)를 따로 쌓는다.
+    # 값은 메모리에 모았다가 flush 때 버킷별로 미리 합쳐서 한 번에 upsert한다.
+    # tiers는 TIERS와 같은 모양이고 'raw'가 있어야 한다. 버킷 길이가 있는 계층마다 rollup_<이름> 테이블을 만든다.
+    def __init__(self, db_path='sensor_history.db', tiers=None, batch_size=1000, retention_check=60):
+        self.tiers = dict(tiers or TIERS)
+        # 집계 계층 이름 → 버킷 길이(초). 집계, 보존 기간 정리, 조회가 모두 이 값을 쓴다.
+        self.rollup_tiers = {tier: bucket for tier, (bucket, _) in self.tiers.items() if bucket}
+        for tier in self.rollup_tiers:
+            if not f'rollup_{tier}'.isidentifier():
+                raise ValueError(f'계층 이름은 테이블 이름에 쓸 수 있어야 합니다: {tier}')
+        self.batch_size = batch_size
+        self.retention_check = retention_check
+        self.last_retention = 0.0
+        self.pending = []
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS raw (sensor TEXT, channel TEXT, ts REAL, value REAL)')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS raw_lookup ON raw (sensor, channel, ts)')
+        for tier in self.rollup_tiers:
+            self.conn.execute(
+                f'CREATE TABLE IF NOT EXISTS rollup_{tier} ('
+                'sensor TEXT, channel TEXT, bucket INTEGER, count INTEGER, sum REAL, min REAL, max REAL, '
+                'PRIMARY KEY (sensor, channel, bucket)) WITHOUT ROWID')
+        self.conn.commit()
+
+    def add(self, sensor, timestamp, reading):
+        self.pending.append((sensor, timestamp, dict(reading)))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def sink(self, name, timestamp, reading):
+        # SensorScheduler의 싱크로 바로 쓸 수 있다.
+        self.add(name, timestamp, reading)
+
+    def flush(self):
+        if not self.pending:
+            return
+        raw_rows = []
+        buckets = {tier: {} for tier in self.rollup_tiers}
+        sized_buckets = [(size, buckets[tier]) for tier, size in self.rollup_tiers.items()]
+        for sensor, timestamp, reading in self.pending:
+            for channel, value in reading.items():
+                raw_rows.append((sensor, channel, timestamp, value))
+                for size, tier_buckets in sized_buckets:
+                    key = (sensor, channel, int(timestamp // size * size))
+                    agg = tier_buckets.get(key)
+                    if agg is None:
+                        tier_buckets[key] = [1, value, value, value]
+                    else:
+                        agg[0] += 1
+                        agg[1] += value
+                        if value < agg[2]:
+                            agg[2] = value
+                        if value > agg[3]:
+                            agg[3] = value
+        self.pending = []
+
+        with self.conn:
+            self.conn.executemany('INSERT INTO raw VALUES (?, ?, ?, ?)', raw_rows)
+            for tier, rows in buckets.items():
+                self.conn.executemany(
+                    f'INSERT INTO rollup_{tier} VALUES (?, ?, ?, ?, ?, ?, ?) '
+                    'ON CONFLICT (sensor, channel, bucket) DO UPDATE SET '
+                    'count = count + excluded.count, sum = sum + excluded.sum, '
+                    'min = MIN(min, excluded.min), max = MAX(max, excluded.max)',
+                    [key + tuple(agg) for key, agg in rows.items()])
+
+        if time.time() - self.last_retention >= self.retention_check:
+            self.enforce_retention()
+
+    def enforce_retention(self, now=None):
+        now = time.time() if now is None else now
+        with self.conn:
+            self.conn.execute('DELETE FROM raw WHERE ts < ?', (now - self.tiers['raw'][1],))
+            for tier in self.rollup_tiers:
+                self.conn.execute(f'DELETE FROM rollup_{tier} WHERE bucket < ?', (now - self.tiers[tier][1],))
+        self.last_retention = time.time()
+
+    def query(self, sensor, channel, start, end, resolution='1m'):
+        # resolution에 해당하는 계층만 읽는다. raw는 (시각, 값), 집계는 (버킷 시작, 개수, 평균, 최소, 최대).
+        self.flush()
+        if resolution == 'raw':
+            return self.conn.execute(
+                'SELECT ts, value FROM raw WHERE sensor = ? AND channel = ? AND ts BETWEEN ? AND ? ORDER BY ts',
+                (sensor, channel, start, end)).fetchall()
+        if resolution not in self.rollup_tiers:
+            raise ValueError(f'알 수 없는 해상도입니다: {resolution}')
+        size = self.rollup_tiers[resolution]
+        return self.conn.execute(
+            f'SELECT bucket, count, sum / count, min, max FROM rollup_{resolution} '
+            'WHERE sensor = ? AND channel = ? AND bucket BETWEEN ? AND ? ORDER BY bucket',
+            (sensor, channel, int(start // size * size), end)).fetchall()
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,122 @@
+import atexit
+import os
+import threading
+import time
+
+
+class SensorLogWriter:
+    # 로그 파일을 한 번만 열어 두고 메모리에 모았다가 크기나 시간 기준을 넘으면 한꺼번에 쓴다.
+    # 쓰기가 뜸해도 flush_interval마다 백그라운드 스레드가 남은 내용을 내보낸다.
+    # max_bytes를 넘거나(rotate_daily면) 날짜가 바뀌면 기존 파일을 옆으로 옮기고 새 파일을 연다.
+    def __init__(self, file_path='sensor_log.txt', buffer_bytes=64 * 1024, flush_interval=5.0,
+                 max_bytes=10 * 1024 * 1024, backup_count=5, rotate_daily=False):
+        self.file_path = file_path
+        self.buffer_bytes = buffer_bytes
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.rotate_daily = rotate_daily
+
+        self.buffer = []
+        self.buffered = 0
+        self.last_flush = time.monotonic()
+        self.file = None
+        self.day = None
+        self._lock = threading.RLock()
+        self._closed = threading.Event()
+        self._open()
+        self._flusher = None
+        if flush_interval:
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+            self._flusher.start()
+        atexit.register(self.close)
+
+    def _open(self):
+        self.file = open(self.file_path, 'a', encoding='utf-8')
+        self.size = self.file.tell()
+        # 이어 쓰는 파일은 마지막으로 쓴 날짜를 파일 날짜로 본다.
+        modified = os.fstat(self.file.fileno()).st_mtime if self.size else None
+        self.day = time.strftime('%Y-%m-%d', time.localtime(modified))
+
+    def write(self, text):
+        with self._lock:
+            if self.rotate_daily:
+                self._roll_day()
+            self.buffer.append(text)
+            self.buffered += len(text.encode('utf-8'))
+            # flush_interval이 0이면 모으지 않고 바로 쓴다.
+            if self.buffered >= self.buffer_bytes or not self.flush_interval:
+                self.flush()
+
+    def _flush_loop(self):
+        # 마지막으로 내보낸 뒤 flush_interval이 지났을 때만 쓴다. 크기 기준으로 방금 썼다면 다음 차례까지 기다린다.
+        wait = self.flush_interval
+        while not self._closed.wait(wait):
+            with self._lock:
+                wait = self.flush_interval - (time.monotonic() - self.last_flush)
+                if wait <= 0:
+                    self.flush()
+                    wait = self.flush_interval
+
+    def flush(self):
+        with self._lock:
+            if self.file is None:
+                return
+            if self.rotate_daily:
+                self._roll_day()
+            if self.buffer:
+                if self.max_bytes and self.size and self.size + self.buffered > self.max_bytes:
+                    self._rotate()
+                self._write_buffer()
+            self.last_flush = time.monotonic()
+
+    def _write_buffer(self):
+        if self.buffer:
+            self.file.write(''.join(self.buffer))
+            self.file.flush()
+            self.size += self.buffered
+            self.buffer = []
+            self.buffered = 0
+
+    def _roll_day(self):
+        # 날짜가 바뀌었으면 자정 전에 모은 줄을 먼저 전날 파일에 쓰고 그 파일을 날짜 이름으로 옮긴다.
+        # 버퍼에는 항상 self.day의 줄만 있으므로 날짜가 섞이지 않는다. 빈 파일이면 날짜만 넘긴다.
+        today = time.strftime('%Y-%m-%d')
+        if today == self.day:
+            return
+        self._write_buffer()
+        if self.size:
+            self.file.close()
+            root, ext = os.path.splitext(self.file_path)
+            os.replace(self.file_path, f'{root}.{self.day}{ext}')
+            self._open()
+        self.day = today
+
+    def _rotate(self):
+        self.file.close()
+        for i in range(self.backup_count - 1, 0, -1):
+            if os.path.exists(f'{self.file_path}.{i}'):
+                os.replace(f'{self.file_path}.{i}', f'{self.file_path}.{i + 1}')
+        if self.backup_count > 0:
+            os.replace(self.file_path, f'{self.file_path}.1')
+        else:
+            os.remove(self.file_path)
+        self._open()
+
+    def close(self):
+        self._closed.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+        with self._lock:
+            if self.file is None:
+                return
+            self.flush()
+            self.file.close()
+            self.file = None
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,105 @@
+import asyncio
+import inspect
+import time
+
+
+class SensorScheduler:
+    # 센서마다 자기 주기로 도는 asyncio 작업을 두고, 읽은 값은 크기가 정해진 큐를 거쳐 싱크로 보낸다.
+    # 싱크가 밀리면 overflow 정책에 따라 센서 쪽이 기다리거나('block') 오래된 값/새 값을 버린다.
+    def __init__(self, sinks=None, queue_size=10000, overflow='block', consumers=1):
+        if overflow not in ('block', 'drop_oldest', 'drop_new'):
+            raise ValueError(f'알 수 없는 overflow 정책입니다: {overflow}')
+        self.sinks = list(sinks or [])
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.consumers = consumers
+        self.sensors = []
+        self.produced = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.sink_errors = 0
+        self.queue = None
+        self.stop_event = None
+        self.loop = None
+
+    def add_sensor(self, name, sensor, interval):
+        self.sensors.append((name, sensor, interval))
+
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+
+    def stop(self):
+        # input() 스레드 등 다른 스레드에서도 부를 수 있도록 이벤트 설정은 이벤트 루프에 맡긴다.
+        if self.stop_event is not None:
+            self.loop.call_soon_threadsafe(self.stop_event.set)
+
+    async def _put(self, item):
+        if self.overflow == 'block':
+            await self.queue.put(item)
+            return
+        if self.queue.full():
+            self.dropped += 1
+            if self.overflow == 'drop_new':
+                return
+            self.queue.get_nowait()
+            self.queue.task_done()
+        self.queue.put_nowait(item)
+
+    async def _poll(self, name, sensor, interval):
+        # 다음 측정 시각을 누적해서 계산하므로 처리 시간이 쌓여도 주기가 밀리지 않는다.
+        loop = asyncio.get_running_loop()
+        next_time = loop.time()
+        while True:
+            sensor.set_env()
+            await self._put((name, time.time(), dict(sensor.env_values)))
+            self.produced += 1
+            next_time += interval
+            delay = next_time - loop.time()
+            if delay < 0:
+                next_time = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    async def _consume(self):
+        while True:
+            name, timestamp, reading = await self.queue.get()
+            try:
+                for sink in self.sinks:
+                    # 싱크 하나가 실패해도 소비자 작업이 끝나면 큐가 비지 않아 run()이 멈추므로, 세고 넘어간다.
+                    try:
+                        result = sink(name, timestamp, reading)
+                        if inspect.isawaitable(result):
+                            await result
+                    except Exception as e:
+                        self.sink_errors += 1
+                        if self.sink_errors == 1:
+                            # 같은 오류가 값마다 반복될 수 있으므로 처음 한 번만 출력하고 이후는 sink_errors로 센다.
+                            print(f'싱크 처리 중 오류가 발생했습니다 ({name}): {e!r}')
+                self.delivered += 1
+            finally:
+                self.queue.task_done()
+
+    async def run(self, duration=None):
+        # duration초가 지나거나 stop()이 불리면 센서 작업을 멈추고, 큐에 남은 값을 모두 보낸 뒤 끝낸다.
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(self.queue_size)
+        self.stop_event = asyncio.Event()
+        consumers = [asyncio.create_task(self._consume()) for _ in range(self.consumers)]
+        pollers = [asyncio.create_task(self._poll(name, sensor, interval))
+                   for name, sensor, interval in self.sensors]
+        try:
+            if duration is None:
+                await self.stop_event.wait()
+            else:
+                try:
+                    await asyncio.wait_for(self.stop_event.wait(), duration)
+                except asyncio.TimeoutError:
+                    self.stop_event.set()
+            for task in pollers:
+                task.cancel()
+            await asyncio.gather(*pollers, return_exceptions=True)
+            await self.queue.join()
+        finally:
+            for task in pollers + consumers:
+                task.cancel()
+            await asyncio.gather(*pollers, *consumers, return_exceptions=True)
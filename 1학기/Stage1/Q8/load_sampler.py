@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import deque
+
+import psutil
+
+
+class LoadSampler:
+    # 백그라운드 스레드가 interval초마다 CPU와 메모리 사용률을 재서 고정 크기 링 버퍼에 넣는다.
+    # 읽는 쪽은 기다리지 않고 가장 최근 값과 최근 구간의 최소/평균/최대를 받는다.
+    def __init__(self, interval=1.0, history_size=60):
+        self.interval = interval
+        self.samples = deque(maxlen=history_size)
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.listeners = []
+
+    def add_listener(self, listener):
+        # 새 값이 들어올 때마다 listener(sampler)를 부른다. 샘플러 스레드에서 실행된다.
+        self.listeners.append(listener)
+
+    def start(self):
+        if self.thread is not None:
+            return
+        # cpu_percent(interval=None)는 직전 호출 이후의 사용률이므로 짧게 한 번 재서 첫 값을 채워 둔다.
+        self._record(psutil.cpu_percent(interval=0.1))
+        self.thread = threading.Thread(target=self._run, name='load-sampler', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            self._record(psutil.cpu_percent(interval=None))
+
+    def _record(self, cpu):
+        sample = (time.time(), cpu, psutil.virtual_memory().percent)
+        with self.lock:
+            self.samples.append(sample)
+        for listener in self.listeners:
+            # 리스너 예외가 샘플러 스레드를 끝내면 부하 값이 더 이상 갱신되지 않으므로 여기서 막는다.
+            try:
+                listener(self)
+            except Exception as e:
+                print(f"부하 샘플 리스너 오류: {e!r}")
+
+    def latest(self):
+        with self.lock:
+            return self.samples[-1] if self.samples else None
+
+    def summary(self):
+        with self.lock:
+            samples = list(self.samples)
+        if not samples:
+            return None
+        cpu = [sample[1] for sample in samples]
+        memory = [sample[2] for sample in samples]
+        return {
+            'timestamp': samples[-1][0],
+            'count': len(samples),
+            'cpu': {'latest': cpu[-1], 'min': min(cpu), 'avg': round(sum(cpu) / len(cpu), 2), 'max': max(cpu)},
+            'memory': {'latest': memory[-1], 'min': min(memory), 'avg': round(sum(memory) / len(memory), 2),
+                       'max': max(memory)},
+        }
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -1,16 +1,55 @@
+import argparse
+import importlib.util
 import platform
 import psutil
 import json
 import os
+import sys
+import threading
+import time
+
+from load_sampler import LoadSampler
+from metrics_server import MetricsRegistry, MetricsServer, render_metric
+
+SENSOR_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Q7")
+
+def load_sensor_computer(sensor_dir=SENSOR_DIR):
+    # Q7 센서 미션 컴퓨터를 불러온다. 파일 이름이 이 모듈과 같아서 다른 모듈 이름으로 읽는다.
+    sensor_dir = os.path.abspath(sensor_dir)
+    if sensor_dir not in sys.path:
+        sys.path.append(sensor_dir)
+    spec = importlib.util.spec_from_file_location("sensor_mission_computer",
+                                                  os.path.join(sensor_dir, "mars_mission_computer.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.MissionComputer
+
+def run_sensor_loop(on_stats, stop_event, sensor_dir=SENSOR_DIR):
+    # SQLite 연결은 만든 스레드에서만 쓸 수 있으므로 센서 컴퓨터를 루프가 도는 스레드 안에서 만든다.
+    sensor_computer = load_sensor_computer(sensor_dir)(on_stats=on_stats)
+    sensor_computer.get_sensor_data(stop_event)
 
 class MissionComputer:
-    def __init__(self):
+    def __init__(self, sample_interval=1.0, history_size=60, top_n=5):
         self.setting_file = 'setting.txt'
         self.default_settings = [
             "os", "os_version", "cpu_type", "cpu_count",
-            "memory", "cpu_usage", "memory_usage"
+            "memory", "cpu_usage", "memory_usage", "processes"
         ]
         self.settings = self.load_or_create_settings()
+        self.top_n = top_n
+        self.collector_timings = {}
+        self.metrics = MetricsRegistry()
+        self.metrics_server = None
+        # OS, CPU 종류, 코어 수, 전체 메모리는 실행 중에 바뀌지 않으므로 시작할 때 한 번만 읽는다.
+        self.static_info = self._timed("info", self._collect_static_info)
+        if "processes" in self.settings:
+            # 프로세스별 cpu_percent는 직전 호출과의 차이이므로 미리 한 번 불러 기준점을 만든다.
+            self._collect_processes()
+        self.load_sampler = LoadSampler(sample_interval, history_size)
+        self.load_sampler.add_listener(self._publish_load_metrics)
+        if "cpu_usage" in self.settings or "memory_usage" in self.settings:
+            self.load_sampler.start()
 
     def load_or_create_settings(self):
         if not os.path.exists(self.setting_file):
@@ -22,40 +61,221 @@ class MissionComputer:
             with open(self.setting_file, 'r', encoding='utf-8') as f:
                 return set(line.strip() for line in f if line.strip())
 
+    def _timed(self, name, collector):
+        start = time.perf_counter()
+        result = collector()
+        self.collector_timings[name] = round((time.perf_counter() - start) * 1000, 3)
+        return result
+
+    def _collect_static_info(self):
+        info = {}
+        if "os" in self.settings:
+            info["Operating System"] = platform.system()
+        if "os_version" in self.settings:
+            info["OS Version"] = platform.version()
+        if "cpu_type" in self.settings:
+            info["CPU Type"] = platform.processor()
+        if "cpu_count" in self.settings:
+            info["CPU Core Count"] = psutil.cpu_count(logical=True)
+        if "memory" in self.settings:
+            mem_mb = round(psutil.virtual_memory().total / (1024 * 1024), 2)
+            info["Total Memory (MB)"] = mem_mb
+        return info
+
+    def _collect_processes(self):
+        # process_iter는 Process 객체를 재사용하므로 cpu_percent가 이전 호출 이후의 사용률이 된다.
+        processes = []
+        for proc in psutil.process_iter(["pid", "name", "cpu_percent", "memory_info", "num_threads"]):
+            info = proc.info
+            if info["memory_info"] is None:
+                continue
+            processes.append({
+                "PID": info["pid"],
+                "Name": info["name"],
+                "CPU Usage (%)": info["cpu_percent"] or 0.0,
+                "RSS (MB)": round(info["memory_info"].rss / (1024 * 1024), 2),
+                "Threads": info["num_threads"],
+            })
+        processes.sort(key=lambda p: (p["CPU Usage (%)"], p["RSS (MB)"]), reverse=True)
+        return processes[:self.top_n]
+
     def get_mission_computer_info(self):
         try:
-            info = {}
-            if "os" in self.settings:
-                info["Operating System"] = platform.system()
-            if "os_version" in self.settings:
-                info["OS Version"] = platform.version()
-            if "cpu_type" in self.settings:
-                info["CPU Type"] = platform.processor()
-            if "cpu_count" in self.settings:
-                info["CPU Core Count"] = psutil.cpu_count(logical=True)
-            if "memory" in self.settings:
-                mem_mb = round(psutil.virtual_memory().total / (1024 * 1024), 2)
-                info["Total Memory (MB)"] = mem_mb
+            info = dict(self.static_info)
 
             print("\n[Mission Computer Info]")
             print(json.dumps(info, indent=4, ensure_ascii=False))
+            return info
         except Exception as e:
             print(f"시스템 정보 수집 중 오류 발생: {e}")
 
+    def refresh_processes(self):
+        processes = self._timed("processes", self._collect_processes)
+        self._publish_process_metrics(processes)
+        return processes
+
+    def get_mission_computer_processes(self):
+        try:
+            if "processes" not in self.settings:
+                return []
+            processes = self.refresh_processes()
+
+            print(f"\n[Mission Computer Top {self.top_n} Processes]")
+            print(json.dumps(processes, indent=4, ensure_ascii=False))
+            return processes
+        except Exception as e:
+            print(f"프로세스 정보 수집 중 오류 발생: {e}")
+
+    def get_collector_timings(self):
+        timings = dict(self.collector_timings)
+        print("\n[Collector Timings (ms)]")
+        print(json.dumps(timings, indent=4, ensure_ascii=False))
+        return timings
+
     def get_mission_computer_load(self):
+        # 백그라운드 샘플러가 모아 둔 값을 읽으므로 바로 돌아온다.
         try:
+            start = time.perf_counter()
             load = {}
-            if "cpu_usage" in self.settings:
-                load["CPU Usage (%)"] = psutil.cpu_percent(interval=1)
-            if "memory_usage" in self.settings:
-                load["Memory Usage (%)"] = psutil.virtual_memory().percent
+            summary = self.load_sampler.summary()
+            if summary is not None:
+                if "cpu_usage" in self.settings:
+                    load["CPU Usage (%)"] = summary["cpu"]["latest"]
+                    load["CPU Usage Recent (%)"] = {key: summary["cpu"][key] for key in ("min", "avg", "max")}
+                if "memory_usage" in self.settings:
+                    load["Memory Usage (%)"] = summary["memory"]["latest"]
+                    load["Memory Usage Recent (%)"] = {key: summary["memory"][key] for key in ("min", "avg", "max")}
+            self.collector_timings["load"] = round((time.perf_counter() - start) * 1000, 3)
 
             print("\n[Mission Computer Load]")
             print(json.dumps(load, indent=4, ensure_ascii=False))
+            return load
         except Exception as e:
             print(f"시스템 부하 수집 중 오류 발생: {e}")
 
+    def _publish_load_metrics(self, sampler):
+        summary = sampler.summary()
+        if summary is None:
+            return
+        text = ""
+        if "cpu_usage" in self.settings:
+            text += render_metric("mission_cpu_usage_percent", "Latest CPU usage.", "gauge",
+                                  [({}, summary["cpu"]["latest"])])
+            text += render_metric("mission_cpu_usage_recent_percent", "CPU usage over the sampler window.", "gauge",
+                                  [({"stat": key}, summary["cpu"][key]) for key in ("min", "avg", "max")])
+        if "memory_usage" in self.settings:
+            text += render_metric("mission_memory_usage_percent", "Latest memory usage.", "gauge",
+                                  [({}, summary["memory"]["latest"])])
+            text += render_metric("mission_memory_usage_recent_percent", "Memory usage over the sampler window.",
+                                  "gauge", [({"stat": key}, summary["memory"][key]) for key in ("min", "avg", "max")])
+        text += render_metric("mission_load_sample_timestamp_seconds", "Time of the latest load sample.", "gauge",
+                              [({}, summary["timestamp"])])
+        self.metrics.publish("load", text)
+        self.metrics.publish("timings", render_metric(
+            "mission_collector_duration_milliseconds", "Last run time of each collector.", "gauge",
+            # 메인 스레드가 키를 추가하는 중일 수 있으므로 복사본을 훑는다.
+            [({"collector": name}, value) for name, value in dict(self.collector_timings).items()]))
+
+    def _publish_process_metrics(self, processes):
+        samples = {"cpu": [], "rss": [], "threads": []}
+        for process in processes:
+            labels = {"pid": process["PID"], "name": process["Name"]}
+            samples["cpu"].append((labels, process["CPU Usage (%)"]))
+            samples["rss"].append((labels, process["RSS (MB)"]))
+            samples["threads"].append((labels, process["Threads"]))
+        self.metrics.publish("processes",
+                             render_metric("mission_process_cpu_percent", "CPU usage of top processes.", "gauge",
+                                           samples["cpu"])
+                             + render_metric("mission_process_rss_megabytes", "RSS of top processes.", "gauge",
+                                             samples["rss"])
+                             + render_metric("mission_process_threads", "Thread count of top processes.", "gauge",
+                                             samples["threads"]))
+
+    def publish_sensor_stats(self, stats):
+        # Q7 MissionComputer의 on_stats 콜백. {항목: MultiWindowStats}를 받아 구간별 통계를 미리 렌더링해 둔다.
+        samples = {"mean": [], "min": [], "max": [], "stddev": [], "samples": []}
+        for channel, windows in stats.items():
+            for window_name, window in windows.windows.items():
+                if not window.count:
+                    continue
+                labels = {"channel": channel, "window": window_name}
+                samples["mean"].append((labels, round(window.mean, 4)))
+                samples["min"].append((labels, window.min))
+                samples["max"].append((labels, window.max))
+                samples["stddev"].append((labels, round(window.std, 4)))
+                samples["samples"].append((labels, window.count))
+        self.metrics.publish("sensors",
+                             render_metric("mission_sensor_mean", "Sensor mean over each window.", "gauge",
+                                           samples["mean"])
+                             + render_metric("mission_sensor_min", "Sensor minimum over each window.", "gauge",
+                                             samples["min"])
+                             + render_metric("mission_sensor_max", "Sensor maximum over each window.", "gauge",
+                                             samples["max"])
+                             + render_metric("mission_sensor_stddev", "Sensor standard deviation over each window.",
+                                             "gauge", samples["stddev"])
+                             + render_metric("mission_sensor_window_samples", "Readings in each window.", "gauge",
+                                             samples["samples"]))
+
+    def _publish_info_metrics(self):
+        labels = {"os": self.static_info.get("Operating System", ""),
+                  "os_version": self.static_info.get("OS Version", ""),
+                  "cpu_type": self.static_info.get("CPU Type", "")}
+        text = render_metric("mission_computer_info", "Static mission computer facts.", "gauge", [(labels, 1)])
+        if "CPU Core Count" in self.static_info:
+            text += render_metric("mission_cpu_cores", "Logical CPU count.", "gauge",
+                                  [({}, self.static_info["CPU Core Count"])])
+        if "Total Memory (MB)" in self.static_info:
+            text += render_metric("mission_memory_total_megabytes", "Total memory.", "gauge",
+                                  [({}, self.static_info["Total Memory (MB)"])])
+        self.metrics.publish("info", text)
+
+    def start_metrics_server(self, host="127.0.0.1", port=9100):
+        # 스크랩은 미리 만들어 둔 스냅샷만 읽으므로 psutil 호출이 일어나지 않는다.
+        self._publish_info_metrics()
+        self._publish_load_metrics(self.load_sampler)
+        self.metrics_server = MetricsServer(self.metrics, host, port)
+        self.metrics_server.start()
+        print(f"메트릭 서버 시작: http://{host}:{self.metrics_server.port}/metrics")
+
+    def close(self):
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
+        self.load_sampler.stop()
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="미션 컴퓨터 상태 확인")
+    parser.add_argument("--serve", type=int, metavar="PORT",
+                        help="지정한 포트에서 Prometheus 형식 /metrics를 계속 제공")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="--serve와 함께 사용, 메트릭 서버가 받을 주소 (기본 127.0.0.1, 외부 공개는 0.0.0.0)")
+    parser.add_argument("--sensors", nargs="?", const=SENSOR_DIR, metavar="Q7_DIR",
+                        help="--serve와 함께 Q7 센서 수집을 돌리며 구간별 센서 통계도 제공")
+    args = parser.parse_args()
+
     runComputer = MissionComputer()
     runComputer.get_mission_computer_info()
     runComputer.get_mission_computer_load()
+    runComputer.get_mission_computer_processes()
+    runComputer.get_collector_timings()
+    if args.serve is not None:
+        runComputer.start_metrics_server(host=args.host, port=args.serve)
+        sensor_stop = threading.Event()
+        sensor_thread = None
+        if args.sensors is not None:
+            sensor_thread = threading.Thread(target=run_sensor_loop,
+                                             args=(runComputer.publish_sensor_stats, sensor_stop, args.sensors),
+                                             name="sensor-loop", daemon=True)
+            sensor_thread.start()
+        try:
+            while True:
+                time.sleep(10)
+                if "processes" in runComputer.settings:
+                    runComputer.refresh_processes()
+        except KeyboardInterrupt:
+            print("\n메트릭 서버를 종료합니다.")
+        sensor_stop.set()
+        if sensor_thread is not None:
+            # 센서 로그와 기록 DB를 닫고 끝나도록 기다린다.
+            sensor_thread.join()
+    runComputer.close()
@@ -0,0 +1,84 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape_label_value(value):
+    # Prometheus 텍스트 형식은 라벨 값 안의 역슬래시, 큰따옴표, 줄바꿈을 이스케이프해야 한다.
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join('{}="{}"'.format(key, _escape_label_value(value)) for key, value in labels.items())
+    return '{' + pairs + '}'
+
+
+def render_metric(name, help_text, metric_type, samples):
+    # samples는 (라벨 dict, 값) 목록이다. Prometheus 텍스트 형식 한 묶음을 돌려준다.
+    lines = [f'# HELP {name} {help_text}', f'# TYPE {name} {metric_type}']
+    for labels, value in samples:
+        if value is None:
+            continue
+        lines.append(f'{name}{_format_labels(labels)} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsRegistry:
+    # 수집하는 쪽이 publish할 때 응답 본문을 미리 만들어 둔다. 스크랩은 만들어 둔 bytes를 그대로 보낸다.
+    def __init__(self):
+        self.groups = {}
+        self.lock = threading.Lock()
+        self.payload = b''
+
+    def publish(self, group, text):
+        with self.lock:
+            self.groups[group] = text
+            self.payload = ''.join(self.groups[name] for name in sorted(self.groups)).encode('utf-8')
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # 헤더와 본문이 따로 전송되므로 Nagle 알고리즘을 끄지 않으면 keep-alive 스크랩마다 지연이 생긴다.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        payload = self.server.registry.payload
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MetricsServer:
+    # /metrics만 응답하는 작은 HTTP 서버를 데몬 스레드에서 돌린다.
+    # 기본은 이 컴퓨터에서만 접속할 수 있는 127.0.0.1이다. 다른 컴퓨터에서 스크랩하려면 host를 직접 준다.
+    def __init__(self, registry, host='127.0.0.1', port=9100):
+        self.httpd = ThreadingHTTPServer((host, port), MetricsHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.registry = registry
+        self.thread = None
+
+    @property
+    def port(self):
+        return self.httpd.server_address[1]
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='metrics-server', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
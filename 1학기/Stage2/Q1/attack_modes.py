@@ -0,0 +1,171 @@
+import hashlib
+import json
+import mmap
+import os
+
+import numpy as np
+
+from mangling_rules import apply_rule, load_rules, parse_rule
+
+# 후보 공간(source)은 모두 [0, total) 정수 구간으로 표현한다.
+# 워커는 자기 구간을 batch()로 조금씩 꺼내 검증기에 넘기고, 체크포인트도 같은 구간 단위로 남긴다.
+#   KeyspaceSource: 자리별 문자 집합의 곱(무차별 대입, 마스크). 인덱스 하나가 후보 하나다.
+#   WordlistSource: 사전 파일의 바이트 위치. 줄은 첫 바이트가 속한 구간의 워커가 맡는다.
+
+MASK_CHARSETS = {
+    'l': b'abcdefghijklmnopqrstuvwxyz',
+    'u': b'ABCDEFGHIJKLMNOPQRSTUVWXYZ',
+    'd': b'0123456789',
+    's': b' !"#$%&\'()*+,-./:;<=>?@[\\]^_`{|}~',
+}
+MASK_CHARSETS['a'] = MASK_CHARSETS['l'] + MASK_CHARSETS['u'] + MASK_CHARSETS['d'] + MASK_CHARSETS['s']
+INT64_MAX = np.iinfo(np.int64).max
+
+
+def source_tag(kind: str, key: dict) -> str:
+    # 체크포인트 파일 이름에 쓸 태그. 마스크·사전+규칙 조합마다 파일이 따로 생기도록 key의 해시를 붙인다.
+    digest = hashlib.sha1(json.dumps(key, sort_keys=True).encode()).hexdigest()[:12]
+    return f'{kind}-{digest}'
+
+
+def parse_mask(mask: str) -> list:
+    # '?l?l?d?d?d?d' 같은 마스크를 자리별 문자 집합 목록으로 바꾼다. '??'는 물음표, 그 밖의 글자는 그대로 쓴다.
+    charsets = []
+    i = 0
+    while i < len(mask):
+        if mask[i] == '?':
+            if i + 1 >= len(mask):
+                raise ValueError(f'Mask {mask!r} ends with a bare ?')
+            name = mask[i + 1]
+            if name == '?':
+                charsets.append(b'?')
+            elif name in MASK_CHARSETS:
+                charsets.append(MASK_CHARSETS[name])
+            else:
+                raise ValueError(f'Unknown mask charset ?{name} in {mask!r}')
+            i += 2
+        else:
+            # 여러 바이트로 인코딩되는 글자(예: '가')는 바이트마다 한 자리씩 차지한다.
+            charsets.extend(bytes([b]) for b in mask[i].encode())
+            i += 1
+    if not charsets:
+        raise ValueError('Mask is empty')
+    return charsets
+
+
+def generate_mask_batch(start: int, end: int, charsets: list) -> np.ndarray:
+    # start~end-1 번 후보를 (개수, 자리 수) uint8 배열로 만든다. 마지막 자리가 가장 빨리 바뀌는 혼합 진법이다.
+    if end > INT64_MAX:
+        return _generate_large_mask_batch(start, end, charsets)
+    idx = np.arange(start, end, dtype=np.int64)
+    rem = np.empty_like(idx)
+    out = np.empty((end - start, len(charsets)), dtype=np.uint8)
+    for pos in range(len(charsets) - 1, -1, -1):
+        alphabet = np.frombuffer(charsets[pos], dtype=np.uint8)
+        np.divmod(idx, len(alphabet), out=(idx, rem))
+        out[:, pos] = alphabet.take(rem)
+    return out
+
+
+def _generate_large_mask_batch(start: int, end: int, charsets: list) -> np.ndarray:
+    # 번호가 int64를 넘는 키 공간용. start의 자릿값은 파이썬 정수로 구하고, 배치 안의 차이만 int64로 더하며 자리올림을 넘긴다.
+    base = start
+    offset = np.arange(end - start, dtype=np.int64)
+    rem = np.empty_like(offset)
+    carry = np.zeros_like(offset)
+    out = np.empty((end - start, len(charsets)), dtype=np.uint8)
+    for pos in range(len(charsets) - 1, -1, -1):
+        alphabet = np.frombuffer(charsets[pos], dtype=np.uint8)
+        base, digit = divmod(base, len(alphabet))
+        np.divmod(offset, len(alphabet), out=(offset, rem))
+        rem += carry
+        rem += digit
+        np.divmod(rem, len(alphabet), out=(carry, rem))
+        out[:, pos] = alphabet.take(rem)
+    return out
+
+class KeyspaceSource:
+    def __init__(self, charsets: list, name: str, key: dict, tag: str = None):
+        self.charsets = charsets
+        self.name = name
+        self.key = key
+        self.tag = tag
+        self.unit = 'pwd'
+        self.total = 1
+        for chars in charsets:
+            self.total *= len(chars)
+
+    def batch(self, start: int, end: int, batch_size: int):
+        # (다음 시작 위치, 후보 배열 목록)을 돌려준다.
+        stop = min(end, start + batch_size)
+        return stop, [generate_mask_batch(start, stop, self.charsets)]
+
+
+def brute_force_source(chars: str, length: int) -> KeyspaceSource:
+    return KeyspaceSource([chars.encode()] * length, f'{len(chars)}^{length} keyspace',
+                          {'chars': chars, 'length': length})
+
+
+def mask_source(mask: str) -> KeyspaceSource:
+    key = {'mask': mask}
+    return KeyspaceSource(parse_mask(mask), f'mask {mask}', key, tag=source_tag('mask', key))
+
+
+class WordlistSource:
+    def __init__(self, path: str, rules: list = None):
+        stat = os.stat(path)
+        self.path = path
+        self.rules = rules or load_rules()
+        self.name = f'wordlist {os.path.basename(path)}' + (f' x {len(self.rules)} rules' if len(self.rules) > 1 else '')
+        self.key = {
+            'wordlist': os.path.abspath(path),
+            'size': stat.st_size,
+            'mtime': int(stat.st_mtime),
+            'rules': self.rules,
+        }
+        self.tag = source_tag('dict', self.key)
+        self.unit = 'B'
+        self.total = stat.st_size
+        # mmap과 파싱한 규칙은 워커 안에서 처음 쓸 때 만든다. 프로세스 사이에는 경로와 규칙 문자열만 넘어간다.
+        self._mm = None
+        self._ops = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_mm'] = None
+        state['_ops'] = None
+        return state
+
+    def _open(self):
+        if self._mm is None:
+            with open(self.path, 'rb') as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.total else b''
+            self._ops = [parse_rule(rule) for rule in self.rules]
+        return self._mm
+
+    def batch(self, start: int, end: int, batch_size: int):
+        mm = self._open()
+        # 규칙 하나당 후보가 하나씩 늘어나므로 읽는 바이트 수를 규칙 수만큼 줄인다.
+        stop = min(end, start + max(1024, batch_size // len(self._ops)))
+        pos = start
+        if pos > 0 and mm[pos - 1] != 0x0A:
+            # 앞 구간에서 시작된 줄은 앞 구간 담당이다.
+            nl = mm.find(b'\n', pos)
+            pos = self.total if nl < 0 else nl + 1
+        if pos >= stop:
+            return stop, []
+        nl = mm.find(b'\n', stop - 1)
+        chunk_end = self.total if nl < 0 else nl + 1
+
+        groups = {}
+        for word in mm[pos:chunk_end].split(b'\n'):
+            word = word.rstrip(b'\r')
+            if not word:
+                continue
+            for ops in self._ops:
+                pwd = apply_rule(ops, word)
+                if pwd:
+                    groups.setdefault(len(pwd), []).append(pwd)
+        arrays = [np.frombuffer(b''.join(words), dtype=np.uint8).reshape(len(words), length)
+                  for length, words in groups.items()]
+        return stop, arrays
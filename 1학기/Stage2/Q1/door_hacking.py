@@ -1,11 +1,26 @@
+import argparse
+import os
+import signal
 import zipfile
-import zlib
 import time
-import torch
 import sys
-from multiprocessing import Process, Queue, Event, cpu_count
+from multiprocessing import Process, Queue, Event, Array, cpu_count
+from queue import Empty, Full
+
+import numpy as np
 from tqdm import tqdm
 
+from attack_modes import WordlistSource, brute_force_source, generate_mask_batch, mask_source
+from keyspace_checkpoint import (checkpoint_path_for, completed_prefix, load_checkpoint, merge_ranges,
+                                 remaining_ranges, remove_checkpoint, save_checkpoint)
+from mangling_rules import load_rules
+from zip_crypto import ZipCryptoVerifier
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
 CHARS = 'abcdefghijklmnopqrstuvwxyz0123456789'
 LENGTH = 6
 
@@ -17,48 +32,223 @@ def base36_encode(idx: int, chars: str, length: int) -> str:
         s.append(chars[rem])
     return ''.join(reversed(s))
 
-def producer(batch_size: int, queue: Queue, stop_evt: Event):
+def generate_batch(start: int, end: int, chars: str = CHARS, length: int = LENGTH) -> np.ndarray:
+    # start~end-1 번 후보를 (개수, length) uint8 배열로 만든다. 자리마다 divmod 한 번씩만 벡터 연산으로 처리한다.
+    return generate_mask_batch(start, end, [chars.encode()] * length)
+
+def as_batch_array(batch) -> np.ndarray:
+    # 생산자가 보내는 배치는 문자열 목록(cuda) 또는 uint8 배열(cpu)이다. 검증기는 (개수, 길이) uint8 배열만 받는다.
+    if isinstance(batch, np.ndarray):
+        return batch
+    return np.frombuffer(''.join(batch).encode(), dtype=np.uint8).reshape(len(batch), -1)
+
+def put_unless_stopped(queue: Queue, item, stop_evt: Event) -> bool:
+    # 워커가 먼저 암호를 찾아 멈추면 큐가 다시 비지 않으므로, 막혀 있지 말고 중지 신호를 확인한다.
+    while not stop_evt.is_set():
+        try:
+            queue.put(item, timeout=0.5)
+            return True
+        except Full:
+            continue
+    return False
+
+def producer(batch_size: int, queue: Queue, stop_evt: Event, backend: str = 'cpu'):
+    ignore_sigint()
     total = len(CHARS) ** LENGTH
     idx = 0
     pbar = tqdm(total=total, desc="Passwords Generated", unit="pwd")
     try:
         while idx < total and not stop_evt.is_set():
             end = min(total, idx + batch_size)
-            indices = torch.arange(idx, end, device='cuda', dtype=torch.long)
-            passwords = [base36_encode(int(i), CHARS, LENGTH)
-                         for i in indices.cpu().tolist()]
-            queue.put(passwords)
+            if backend == 'cuda':
+                indices = torch.arange(idx, end, device='cuda', dtype=torch.long)
+                passwords = [base36_encode(int(i), CHARS, LENGTH)
+                             for i in indices.cpu().tolist()]
+            else:
+                passwords = generate_batch(idx, end)
+            if not put_unless_stopped(queue, passwords, stop_evt):
+                break
             pbar.update(len(passwords))
             idx = end
     finally:
         pbar.close()
         for _ in range(cpu_count()):
-            queue.put(None)
+            if not put_unless_stopped(queue, None, stop_evt):
+                # 아무도 읽지 않을 배치가 파이프에 남아 있어도 프로세스가 끝날 수 있게 한다.
+                queue.cancel_join_thread()
+                break
 
 def worker(zip_path: str, queue: Queue, stop_evt: Event, result_q: Queue):
-    zf = zipfile.ZipFile(zip_path)
-    to_test = zf.namelist()[0]
+    ignore_sigint()
+    verifier = ZipCryptoVerifier(zip_path)
     while not stop_evt.is_set():
-        batch = queue.get()
+        try:
+            batch = queue.get(timeout=0.5)
+        except Empty:
+            continue
         if batch is None:
             break
-        for pwd in batch:
+        pwd = verifier.find(as_batch_array(batch))
+        if pwd is not None:
+            stop_evt.set()
+            result_q.put((pwd, time.time()))
+            return
+
+def split_ranges(ranges: list, parts: int) -> list:
+    # 남은 구간들을 전체 개수가 거의 같도록 parts 묶음으로 나눈다. 묶음 하나는 여러 구간일 수 있다.
+    total = sum(end - start for start, end in ranges)
+    step, extra = divmod(total, parts)
+    groups = []
+    pending = list(ranges)
+    for i in range(parts):
+        need = step + (1 if i < extra else 0)
+        group = []
+        while need > 0:
+            start, end = pending.pop(0)
+            take = min(need, end - start)
+            group.append((start, start + take))
+            if start + take < end:
+                pending.insert(0, (start + take, end))
+            need -= take
+        groups.append(group)
+    return groups
+
+def ignore_sigint():
+    # Ctrl+C는 부모만 받아 중지 신호를 돌리고, 자식은 하던 배치를 마친 뒤 스스로 끝난다.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def static_worker(zip_path: str, source, ranges: list, batch_size: int,
+                  stop_evt: Event, result_q: Queue, counters, slot: int):
+    # 생산자 없이 자기 구간의 후보를 직접 만들어 검사한다. 진행 상황은 공유 메모리 카운터의 자기 칸에만 쓴다.
+    ignore_sigint()
+    verifier = ZipCryptoVerifier(zip_path)
+    for start, end in ranges:
+        idx = start
+        while idx < end and not stop_evt.is_set():
+            batch_end, batches = source.batch(idx, end, batch_size)
+            for batch in batches:
+                pwd = verifier.find(batch)
+                if pwd is not None:
+                    stop_evt.set()
+                    result_q.put((pwd, time.time()))
+                    return
+            counters[slot] += batch_end - idx
+            idx = batch_end
+
+def checkpoint_key(zip_path: str, source) -> dict:
+    verifier = ZipCryptoVerifier(zip_path)
+    return {
+        'zip': os.path.basename(zip_path),
+        'member': verifier.member,
+        'crc': verifier.crc,
+        **source.key,
+    }
+
+def display_password(pwd: bytes) -> str:
+    # 화면 출력용. 암호는 바이트 그대로 맞춰 보므로 UTF-8이 아닌 바이트는 \xNN으로 보여 준다.
+    return pwd.decode('utf-8', errors='backslashreplace')
+
+def save_password(pwd: bytes):
+    # 지역 인코딩을 거치면 다른 암호가 되므로 찾은 바이트를 그대로 쓴다.
+    with open('password.txt', 'wb') as f:
+        f.write(pwd)
+
+def unlock_zip_static(zip_path: str, batch_size: int = 100_000, workers_count: int = None,
+                      checkpoint_path: str = None, checkpoint_interval: float = 30.0, source=None):
+    # source를 주지 않으면 CHARS^LENGTH 전체를 무차별 대입한다. Ctrl+C로 멈추면 진행 상황을 저장한 뒤 KeyboardInterrupt를 다시 올린다.
+    start_time = time.time()
+    source = source or brute_force_source(CHARS, LENGTH)
+    workers_count = workers_count or cpu_count()
+    total = source.total
+    checkpoint_path = checkpoint_path or checkpoint_path_for(zip_path, source.tag)
+    checkpoint = load_checkpoint(checkpoint_path, checkpoint_key(zip_path, source))
+    done_before = checkpoint['done']
+    remaining = remaining_ranges(total, done_before)
+    left = sum(end - start for start, end in remaining)
+    print(f"[i] Trying {source.name}")
+    if left < total:
+        print(f"[i] Resuming from {checkpoint_path}: {total - left:,} of {total:,} {source.unit} already tested")
+    if left == 0:
+        print(f"[✘] Password not found in {source.name}.")
+        return None
+    workers_count = min(workers_count, left)
+
+    stop_evt = Event()
+    result_q = Queue()
+    # 워커마다 한 칸씩 쓰므로 잠금이 필요 없다.
+    counters = Array('q', workers_count, lock=False)
+    assignments = split_ranges(remaining, workers_count)
+
+    def save_progress():
+        done = list(done_before)
+        for slot, ranges in enumerate(assignments):
+            done.extend(completed_prefix(ranges, counters[slot]))
+        checkpoint['done'] = merge_ranges(done)
+        save_checkpoint(checkpoint_path, checkpoint)
+
+    workers = []
+    for slot, ranges in enumerate(assignments):
+        p = Process(target=static_worker,
+                    args=(zip_path, source, ranges, batch_size, stop_evt, result_q, counters, slot))
+        p.start()
+        workers.append(p)
+
+    pbar = tqdm(total=total, initial=total - left, desc="Passwords Tested", unit=source.unit,
+                unit_scale=source.unit == 'B')
+    result = None
+    interrupted = False
+    last_saved = time.time()
+    try:
+        while result is None:
             try:
-                _ = zf.read(to_test, pwd=pwd.encode())
-            except (RuntimeError, zipfile.BadZipFile, zlib.error):
-                continue
-            else:
-                stop_evt.set()
-                result_q.put((pwd, time.time()))
-                return
+                result = result_q.get(timeout=0.5)
+            except Empty:
+                if not any(p.is_alive() for p in workers):
+                    # 마지막 순간에 찾은 결과가 큐에 남아 있을 수 있다.
+                    try:
+                        result = result_q.get(timeout=0.5)
+                    except Empty:
+                        break
+            pbar.n = total - left + sum(counters)
+            pbar.refresh()
+            if time.time() - last_saved >= checkpoint_interval:
+                save_progress()
+                last_saved = time.time()
+    except KeyboardInterrupt:
+        print("\n[!] Interrupted by user. Stopping all processes...")
+        interrupted = True
+    finally:
+        stop_evt.set()
+        for p in workers:
+            p.join()
+        pbar.n = total - left + sum(counters)
+        pbar.close()
 
-def unlock_zip_parallel(zip_path: str, batch_size: int = 100_000):
+    if result is None:
+        # 워커가 모두 멈춘 뒤라 카운터가 확정되었으므로 마지막 진행 상황을 남긴다.
+        save_progress()
+        if checkpoint['done'] == [(0, total)]:
+            print(f"\n[✘] Password not found in {source.name}.")
+        else:
+            print(f"[i] Progress saved to {checkpoint_path}. Run again to resume.")
+        if interrupted:
+            raise KeyboardInterrupt
+        return None
+    remove_checkpoint(checkpoint_path)
+    pwd, found_time = result
+    elapsed = found_time - start_time
+    print(f"\n[✔] Success! Password: '{display_password(pwd)}'")
+    print(f"    Elapsed: {elapsed:.2f}s (workers={workers_count}, batch_size={batch_size})")
+    save_password(pwd)
+    return pwd
+
+def unlock_zip_parallel(zip_path: str, batch_size: int = 100_000, backend: str = 'cpu'):
     start_time = time.time()
     q = Queue(maxsize=cpu_count() * 2)
     stop_evt = Event()
     result_q = Queue()
 
-    prod = Process(target=producer, args=(batch_size, q, stop_evt))
+    prod = Process(target=producer, args=(batch_size, q, stop_evt, backend))
     prod.start()
 
     workers = []
@@ -67,26 +257,103 @@ def unlock_zip_parallel(zip_path: str, batch_size: int = 100_000):
         p.start()
         workers.append(p)
 
+    result = None
     try:
-        pwd, found_time = result_q.get()
-        elapsed = found_time - start_time
-        print(f"\n[✔] Success! Password: '{pwd}'")
-        print(f"    Elapsed: {elapsed:.2f}s (batch_size={batch_size})")
-
-        with open('password.txt', 'w') as f:
-            f.write(pwd)
+        while result is None:
+            try:
+                result = result_q.get(timeout=0.5)
+            except Empty:
+                if not prod.is_alive() and not any(p.is_alive() for p in workers):
+                    # 마지막 순간에 찾은 결과가 큐에 남아 있을 수 있다.
+                    try:
+                        result = result_q.get(timeout=0.5)
+                    except Empty:
+                        break
     except KeyboardInterrupt:
         print("\n[!] Interrupted by user. Stopping all processes...")
         stop_evt.set()
+        raise
     finally:
+        stop_evt.set()
         prod.join()
         for p in workers:
             p.join()
 
+    if result is None:
+        print(f"\n[✘] Password not found in {len(CHARS)}^{LENGTH} keyspace.")
+        return None
+    pwd, found_time = result
+    elapsed = found_time - start_time
+    print(f"\n[✔] Success! Password: '{display_password(pwd)}'")
+    print(f"    Elapsed: {elapsed:.2f}s (batch_size={batch_size})")
+    save_password(pwd)
+    return pwd
+
 if __name__ == "__main__":
-    if len(sys.argv) == 2:
-        zip_path = sys.argv[1]
-    else:
+    parser = argparse.ArgumentParser(description="Recover the emergency storage zip password")
+    parser.add_argument("zip_path", nargs="?")
+    parser.add_argument("--backend", choices=["cpu", "cuda"], default="cpu",
+                        help="cpu: NumPy candidates checked in each worker (default), "
+                             "cuda: torch on GPU through the producer queue (opt-in, no checkpoints)")
+    parser.add_argument("--batch-size", type=int, default=100_000, help="candidates per batch (at least 1)")
+    parser.add_argument("--mode", choices=["static", "queue"], default="static",
+                        help="static: each worker scans its own slice of the keyspace, queue: one producer feeds all workers")
+    parser.add_argument("--workers", type=int, default=None, help="static mode worker count (default: cpu count)")
+    parser.add_argument("--wordlist", action="append", default=[],
+                        help="try every line of this file first (repeatable)")
+    parser.add_argument("--rules", default=None,
+                        help="mangling rules for --wordlist: 'basic' or a rule file (default: words as-is)")
+    parser.add_argument("--mask", action="append", default=[],
+                        help="try a mask such as ?l?l?d?d?d?d after the wordlists (repeatable)")
+    parser.add_argument("--no-brute", action="store_true", help="stop after the wordlist and mask attacks")
+    parser.add_argument("--checkpoint", default=None,
+                        help="static mode progress file prefix (default: <zip_path>)")
+    parser.add_argument("--checkpoint-interval", type=float, default=30.0, help="seconds between checkpoint saves")
+    parser.add_argument("--restart", action="store_true", help="ignore any saved progress and start over")
+    args = parser.parse_args()
+    # 0이나 음수면 배치가 늘 비어 작업자가 끝없이 돈다.
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    zip_path = args.zip_path
+    if zip_path is None:
         zip_path = "emergency_storage_key.zip"
         print(f"[i] No argument given. Using default: {zip_path}")
-    unlock_zip_parallel(zip_path)
+    try:
+        ZipCryptoVerifier(zip_path)
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        print(f"[!] Cannot attack {zip_path}: {e}")
+        sys.exit(1)
+    if args.backend == 'cuda' and torch is None:
+        print("[!] torch is not installed. Falling back to the cpu backend.")
+        args.backend = 'cpu'
+    if args.mode == 'static' and args.backend == 'cuda':
+        print("[i] The cuda backend needs a producer. Using queue mode.")
+        args.mode = 'queue'
+    try:
+        rules = load_rules(args.rules)
+        # 가능성이 높은 후보부터: 사전 → 마스크 → 전체 키 공간 순서로 시도한다.
+        sources = [WordlistSource(path, rules) for path in args.wordlist]
+        sources += [mask_source(mask) for mask in args.mask]
+    except (OSError, ValueError) as e:
+        print(f"[!] {e}")
+        sys.exit(1)
+    if not args.no_brute:
+        sources.append(None)
+
+    try:
+        for source in sources:
+            if source is None and args.mode == 'queue':
+                unlock_zip_parallel(zip_path, args.batch_size, args.backend)
+                break
+            source = source or brute_force_source(CHARS, LENGTH)
+            checkpoint_path = checkpoint_path_for(args.checkpoint or zip_path, source.tag)
+            if args.restart:
+                remove_checkpoint(checkpoint_path)
+            if unlock_zip_static(zip_path, args.batch_size, args.workers, checkpoint_path,
+                                 args.checkpoint_interval, source) is not None:
+                break
+    except KeyboardInterrupt:
+        sys.exit(130)
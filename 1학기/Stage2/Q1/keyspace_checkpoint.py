@@ -0,0 +1,89 @@
+import json
+import os
+
+# 키 공간 탐색 진행 상황을 [시작, 끝) 구간 목록으로 저장한다.
+# 'key'에는 대상 파일과 공격 방식(문자 집합·길이, 마스크, 사전·규칙) 정보가 들어 있어, 탐색 조건이 바뀌면 예전 체크포인트를 쓰지 않는다.
+
+CHECKPOINT_SUFFIX = '.checkpoint.json'
+
+
+def checkpoint_path_for(zip_path, tag=None):
+    # 공격 방식마다 진행 파일을 따로 둔다. 무차별 대입(tag 없음)은 <zip>.checkpoint.json이다.
+    return zip_path + (f'.{tag}' if tag else '') + CHECKPOINT_SUFFIX
+
+
+def new_checkpoint(key):
+    return {
+        'key': key,
+        'done': [],
+    }
+
+
+def load_checkpoint(checkpoint_path, key):
+    try:
+        with open(checkpoint_path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+            if data['key'] != key:
+                return new_checkpoint(key)
+            return {
+                'key': key,
+                'done': merge_ranges(data['done']),
+            }
+    except (FileNotFoundError, ValueError, KeyError, TypeError):
+        return new_checkpoint(key)
+
+
+def save_checkpoint(checkpoint_path, checkpoint):
+    # 중간에 종료되어도 체크포인트가 깨지지 않도록 임시 파일에 쓰고 교체한다.
+    tmp_path = checkpoint_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump({
+            'key': checkpoint['key'],
+            'done': [list(r) for r in checkpoint['done']],
+        }, file, ensure_ascii=False)
+    os.replace(tmp_path, checkpoint_path)
+
+
+def remove_checkpoint(checkpoint_path):
+    try:
+        os.remove(checkpoint_path)
+    except FileNotFoundError:
+        pass
+
+
+def merge_ranges(ranges):
+    # 겹치거나 맞닿은 구간을 합쳐 정렬된 목록으로 만든다.
+    merged = []
+    for start, end in sorted((int(s), int(e)) for s, e in ranges if s < e):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def remaining_ranges(total, done):
+    # [0, total)에서 이미 끝난 구간을 뺀 나머지 구간.
+    remaining = []
+    pos = 0
+    for start, end in merge_ranges(done):
+        if start > pos:
+            remaining.append((pos, min(start, total)))
+        pos = max(pos, end)
+        if pos >= total:
+            break
+    if pos < total:
+        remaining.append((pos, total))
+    return remaining
+
+
+def completed_prefix(ranges, count):
+    # 구간 목록을 순서대로 처리하며 count개를 끝냈을 때 완료된 구간들.
+    completed = []
+    for start, end in ranges:
+        if count <= 0:
+            break
+        step = min(count, end - start)
+        completed.append((start, start + step))
+        count -= step
+    return completed
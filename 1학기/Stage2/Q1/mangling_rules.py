@@ -0,0 +1,64 @@
+# 사전 단어를 변형하는 간단한 규칙. hashcat 규칙 문법의 일부만 지원한다.
+#   :  그대로        l  소문자        u  대문자        c  첫 글자만 대문자
+#   r  뒤집기        d  두 번 반복    $X 뒤에 X 붙이기  ^X 앞에 X 붙이기
+#   sXY  X를 모두 Y로 바꾸기
+# 한 줄에 여러 함수를 이어 쓰면 왼쪽부터 차례로 적용한다. 예: c$1 → 'mars' → 'Mars1'
+
+BASIC_RULES = [':', 'c', 'u', 'r', 'd', '$1', '$!', '$1$2$3', 'c$1', 'sa@', 'se3', 'so0', 'si1']
+
+ARG_COUNTS = {':': 0, 'l': 0, 'u': 0, 'c': 0, 'r': 0, 'd': 0, '$': 1, '^': 1, 's': 2}
+
+
+def parse_rule(text: str) -> list:
+    ops = []
+    i = 0
+    while i < len(text):
+        name = text[i]
+        if name == ' ':
+            i += 1
+            continue
+        if name not in ARG_COUNTS:
+            raise ValueError(f'Unknown rule function {name!r} in {text!r}')
+        count = ARG_COUNTS[name]
+        args = text[i + 1:i + 1 + count]
+        if len(args) != count:
+            raise ValueError(f'Rule function {name!r} needs {count} argument(s) in {text!r}')
+        ops.append((name, args.encode('latin-1')))
+        i += 1 + count
+    return ops
+
+
+def apply_rule(ops: list, word: bytes) -> bytes:
+    for name, args in ops:
+        if name == 'l':
+            word = word.lower()
+        elif name == 'u':
+            word = word.upper()
+        elif name == 'c':
+            word = word[:1].upper() + word[1:].lower()
+        elif name == 'r':
+            word = word[::-1]
+        elif name == 'd':
+            word = word + word
+        elif name == '$':
+            word = word + args
+        elif name == '^':
+            word = args + word
+        elif name == 's':
+            word = word.replace(args[:1], args[1:])
+    return word
+
+
+def load_rules(spec: str = None) -> list:
+    # None이면 단어를 그대로, 'basic'이면 내장 규칙을, 그 밖에는 규칙 파일(한 줄에 하나, #은 주석)을 쓴다.
+    if spec is None:
+        lines = [':']
+    elif spec == 'basic':
+        lines = BASIC_RULES
+    else:
+        with open(spec, 'r', encoding='utf-8') as f:
+            lines = [line.strip() for line in f]
+    rules = [line for line in lines if line and not line.startswith('#')]
+    for rule in rules:
+        parse_rule(rule)
+    return rules
@@ -0,0 +1,170 @@
+import struct
+import zipfile
+import zlib
+
+import numpy as np
+
+# PKWARE 전통 암호화(ZipCrypto) 검증기.
+# 암호화 헤더 12바이트를 한 번만 읽어 두고, 후보 배치 전체를 NumPy uint32 배열로 한꺼번에 복호화한다.
+# 헤더 마지막 바이트(check byte)가 맞지 않는 후보(약 255/256)는 여기서 바로 버리고,
+# 살아남은 후보만 본문 전체를 복호화해 압축 해제와 CRC 검사까지 한다.
+
+LOCAL_HEADER = struct.Struct('<4sHHHHHIIIHH')
+LOCAL_SIGNATURE = b'PK\x03\x04'
+ENCRYPTION_HEADER_SIZE = 12
+CHUNK_SIZE = 4096
+
+
+def _make_crc_table() -> list:
+    table = []
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xEDB88320 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+CRC_TABLE = _make_crc_table()
+CRC_TABLE_NP = np.array(CRC_TABLE, dtype=np.uint32)
+
+
+class ZipCryptoKeys:
+    # 후보 하나를 위한 스칼라 키 상태. 헤더를 통과한 소수의 후보에만 쓴다.
+
+    def __init__(self, password: bytes = b'', keys: tuple = (0x12345678, 0x23456789, 0x34567890)):
+        self.k0, self.k1, self.k2 = keys
+        for c in password:
+            self.update(c)
+
+    def update(self, c: int):
+        self.k0 = (self.k0 >> 8) ^ CRC_TABLE[(self.k0 ^ c) & 0xFF]
+        self.k1 = ((self.k1 + (self.k0 & 0xFF)) * 134775813 + 1) & 0xFFFFFFFF
+        self.k2 = (self.k2 >> 8) ^ CRC_TABLE[(self.k2 ^ (self.k1 >> 24)) & 0xFF]
+
+    def decrypt(self, data: bytes) -> bytes:
+        out = bytearray(len(data))
+        for i, c in enumerate(data):
+            t = (self.k2 | 2) & 0xFFFF
+            p = c ^ (((t * (t ^ 1)) >> 8) & 0xFF)
+            out[i] = p
+            self.update(p)
+        return bytes(out)
+
+
+class ZipCryptoVerifier:
+    def __init__(self, zip_path: str, member: str = None):
+        with zipfile.ZipFile(zip_path) as zf:
+            info = zf.getinfo(member) if member else zf.infolist()[0]
+        if not info.flag_bits & 0x1:
+            raise ValueError(f'{info.filename} is not encrypted')
+        if info.compress_type == 99:
+            raise ValueError(f'{info.filename} uses AES encryption, not ZipCrypto')
+
+        with open(zip_path, 'rb') as f:
+            f.seek(info.header_offset)
+            fields = LOCAL_HEADER.unpack(f.read(LOCAL_HEADER.size))
+            if fields[0] != LOCAL_SIGNATURE:
+                raise zipfile.BadZipFile('Bad local file header')
+            raw_time = fields[4]
+            f.seek(fields[9] + fields[10], 1)
+            payload = f.read(info.compress_size)
+
+        self.zip_path = zip_path
+        self.member = info.filename
+        self.compress_type = info.compress_type
+        self.crc = info.CRC
+        self.header = np.frombuffer(payload[:ENCRYPTION_HEADER_SIZE], dtype=np.uint8).astype(np.uint32)
+        self.body = payload[ENCRYPTION_HEADER_SIZE:]
+        # 데이터 디스크립터(bit 3)를 쓰면 CRC 대신 수정 시각의 상위 바이트가 check byte다.
+        if info.flag_bits & 0x8:
+            self.check_byte = (raw_time >> 8) & 0xFF
+        else:
+            self.check_byte = (info.CRC >> 24) & 0xFF
+
+    def header_matches(self, batch: np.ndarray):
+        # (개수, 길이) uint8 후보 배열을 받아 check byte가 맞는 행 번호와, 그 행들의 헤더 복호화 직후 키 상태를 돌려준다.
+        n, width = batch.shape
+        k0 = np.full(n, 0x12345678, dtype=np.uint32)
+        k1 = np.full(n, 0x23456789, dtype=np.uint32)
+        k2 = np.full(n, 0x34567890, dtype=np.uint32)
+        tmp = np.empty(n, dtype=np.uint32)
+
+        # 임시 배열을 만들지 않도록 모든 연산을 out=으로 제자리에서 한다. uint32 곱셈은 2^32로 자연스럽게 잘린다.
+        def update(c):
+            np.bitwise_xor(k0, c, out=tmp)
+            np.bitwise_and(tmp, 0xFF, out=tmp)
+            np.right_shift(k0, 8, out=k0)
+            np.bitwise_xor(k0, CRC_TABLE_NP.take(tmp), out=k0)
+            np.bitwise_and(k0, 0xFF, out=tmp)
+            np.add(k1, tmp, out=k1)
+            np.multiply(k1, 134775813, out=k1)
+            np.add(k1, 1, out=k1)
+            np.right_shift(k1, 24, out=tmp)
+            np.bitwise_xor(tmp, k2, out=tmp)
+            np.bitwise_and(tmp, 0xFF, out=tmp)
+            np.right_shift(k2, 8, out=k2)
+            np.bitwise_xor(k2, CRC_TABLE_NP.take(tmp), out=k2)
+
+        for pos in range(width):
+            update(batch[:, pos])
+
+        plain = None
+        for c in self.header:
+            np.bitwise_or(k2, 2, out=tmp)
+            tmp &= 0xFFFF
+            plain = tmp * (tmp ^ 1)
+            plain >>= 8
+            plain &= 0xFF
+            plain ^= c
+            update(plain)
+        rows = np.flatnonzero(plain == self.check_byte)
+        return rows, (k0[rows], k1[rows], k2[rows])
+
+    def verify(self, password: bytes, header_keys: tuple = None) -> bool:
+        # 본문 전체를 복호화·압축 해제하고 CRC까지 맞춰 본다. 중간에 deflate 오류가 나면 바로 탈락이다.
+        # header_keys가 있으면 헤더까지 복호화한 키 상태에서 바로 시작한다.
+        if header_keys is None:
+            keys = ZipCryptoKeys(password)
+            keys.decrypt(self.header.astype(np.uint8).tobytes())
+        else:
+            keys = ZipCryptoKeys(keys=header_keys)
+        if self.compress_type == zipfile.ZIP_STORED:
+            decomp = None
+        elif self.compress_type == zipfile.ZIP_DEFLATED:
+            decomp = zlib.decompressobj(-15)
+        else:
+            return self._verify_with_zipfile(password)
+
+        crc = 0
+        try:
+            for i in range(0, len(self.body), CHUNK_SIZE):
+                data = keys.decrypt(self.body[i:i + CHUNK_SIZE])
+                if decomp is not None:
+                    data = decomp.decompress(data)
+                crc = zlib.crc32(data, crc)
+            if decomp is not None:
+                crc = zlib.crc32(decomp.flush(), crc)
+                if not decomp.eof:
+                    return False
+        except zlib.error:
+            return False
+        return crc == self.crc
+
+    def _verify_with_zipfile(self, password: bytes) -> bool:
+        # bzip2·lzma 등은 zipfile에 맡긴다. 헤더 검사를 통과한 후보만 오므로 느려도 괜찮다.
+        try:
+            with zipfile.ZipFile(self.zip_path) as zf:
+                zf.read(self.member, pwd=password)
+        except (RuntimeError, zipfile.BadZipFile, zlib.error, EOFError, OSError):
+            return False
+        return True
+
+    def find(self, batch: np.ndarray):
+        # 배치에서 진짜 암호를 찾으면 bytes로, 없으면 None을 돌려준다.
+        rows, (k0, k1, k2) = self.header_matches(batch)
+        for i, row in enumerate(rows.tolist()):
+            pwd = batch[row].tobytes()
+            if self.verify(pwd, (int(k0[i]), int(k1[i]), int(k2[i]))):
+                return pwd
+        return None